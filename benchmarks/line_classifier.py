@@ -0,0 +1,135 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+"""
+Compare the number of regex calls and the time per line needed to classify
+the lines of a config file.
+
+Usage: python -m benchmarks.line_classifier [config_file]
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable, List
+
+from src.simple_config_parser import simple_config_parser as scp
+from src.simple_config_parser.constants import (
+    EMPTY_LINE_RE,
+    LINE_COMMENT_RE,
+    LINE_RE,
+    OPTION_LINE_RE,
+    OPTION_RE,
+    OPTIONS_BLOCK_START_RE,
+    SECTION_LINE_RE,
+    SECTION_RE,
+)
+
+DEFAULT_CONFIG = Path(__file__).parent.parent.joinpath(
+    "tests", "assets", "klipper_config.txt"
+)
+
+
+class CountingPattern:
+    """Wraps a compiled regex and counts the calls to match()"""
+
+    def __init__(self, pattern) -> None:
+        self.pattern = pattern
+        self.calls = 0
+
+    def match(self, *args):
+        self.calls += 1
+        return self.pattern.match(*args)
+
+
+class SequentialClassifier:
+    """Replays the regex calls of the sequential matching done before the
+    line classifier, including the repeated matches to extract the groups"""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.in_option_block = False
+
+    def __call__(self, line: str) -> None:
+        if SECTION_RE.match(line):
+            SECTION_RE.match(line).group(1)
+            # detected by the first match, then matched again for the name
+            self.calls += 2
+            self.in_option_block = False
+        elif OPTION_RE.match(line):
+            OPTION_RE.match(line).group(1)
+            OPTION_RE.match(line).group(2)
+            # two matches to detect, then matched again for name and value
+            self.calls += 4
+            self.in_option_block = False
+        elif OPTIONS_BLOCK_START_RE.match(line):
+            OPTIONS_BLOCK_START_RE.match(line).group(1)
+            # three matches to detect, then matched again for the name
+            self.calls += 4
+            self.in_option_block = True
+        elif self.in_option_block:
+            self.calls += 3
+        elif EMPTY_LINE_RE.match(line):
+            self.calls += 4
+        else:
+            LINE_COMMENT_RE.match(line)
+            self.calls += 5
+
+
+def single_pass_classify(line: str):
+    """Classification with LINE_RE only, without the first character dispatch"""
+    match = LINE_RE.match(line)
+    return (None, None, None) if match is None else scp._line_values(match)
+
+
+def time_per_line(classify: Callable, lines: List[str]) -> float:
+    def run():
+        for line in lines:
+            classify(line)
+
+    number = 20
+    return min(timeit.repeat(run, number=number, repeat=5)) / number / len(lines)
+
+
+def main(config_file: Path) -> None:
+    with open(config_file, "r") as file:
+        lines = file.readlines()
+
+    sequential = SequentialClassifier()
+    for line in lines:
+        sequential(line)
+
+    section_counter = CountingPattern(SECTION_LINE_RE)
+    option_counter = CountingPattern(OPTION_LINE_RE)
+    scp.SECTION_LINE_RE, scp.OPTION_LINE_RE = section_counter, option_counter
+    try:
+        for line in lines:
+            scp.SimpleConfigParser._classify_line(line)
+    finally:
+        scp.SECTION_LINE_RE, scp.OPTION_LINE_RE = SECTION_LINE_RE, OPTION_LINE_RE
+
+    results = [
+        ("sequential _match_*", sequential.calls, SequentialClassifier()),
+        ("single pass LINE_RE", len(lines), single_pass_classify),
+        (
+            "first char dispatch",
+            section_counter.calls + option_counter.calls,
+            scp.SimpleConfigParser._classify_line,
+        ),
+    ]
+
+    print(f"{config_file.name}: {len(lines)} lines")
+    print(f"{'classifier':<22}{'regex calls':>12}{'calls/line':>12}{'ns/line':>10}")
+    for name, calls, classify in results:
+        ns = f"{time_per_line(classify, lines) * 1e9:.0f}"
+        print(f"{name:<22}{calls:>12}{calls / len(lines):>12.2f}{ns:>10}")
+
+
+if __name__ == "__main__":
+    main(Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CONFIG)
@@ -0,0 +1,196 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from ..simple_config_parser.nodes import OptionNode
+
+# the parser state after parsing a file: current section, current options
+# block and current collector
+ParseState = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+class CachedConfig(NamedTuple):
+    """A parsed config file and the stat values it was parsed with"""
+
+    mtime_ns: int
+    size: int
+    config: Dict
+    state: ParseState
+    nbytes: int
+
+
+class ConfigCache:
+    """
+    An in-process LRU cache of parsed config files, keyed by their path
+
+    The cache is limited by the number of entries and by the approximate
+    memory size of the cached configs, the least recently used entries are
+    evicted first. A limit of 0 disables the cache, or the byte size limit.
+
+    Configs are copied when they are put into the cache and when they are
+    taken out of it, so that every parser gets its own, independently mutable
+    config.
+    """
+
+    def __init__(self, max_entries: int = 0, max_bytes: int = 0) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, CachedConfig] = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether configs are cached at all"""
+        return self.max_entries > 0
+
+    @property
+    def nbytes(self) -> int:
+        """The approximate memory size of all cached configs"""
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def configure(self, max_entries: int, max_bytes: int = 0) -> None:
+        """Change the limits of the cache, evict entries exceeding them"""
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def get(
+        self, path: str, mtime_ns: int, size: int, copy: bool = True
+    ) -> Tuple[Dict, ParseState] | None:
+        """
+        Return a copy of the cached config of a file and the parser state after
+        parsing it, or None if the file is not cached or changed since. If
+        'copy' is False, the cached config itself is returned, it must not be
+        changed.
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or (entry.mtime_ns, entry.size) != (mtime_ns, size):
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(path)
+        if not copy:
+            return entry.config, entry.state
+        return copy_config(entry.config), entry.state
+
+    def put(
+        self, path: str, mtime_ns: int, size: int, config: Dict, state: ParseState
+    ) -> None:
+        """Put a copy of the config of a file into the cache"""
+        config = copy_config(config)
+        entry = CachedConfig(mtime_ns, size, config, state, config_size(config))
+        with self._lock:
+            self._remove(path)
+            self._entries[path] = entry
+            self._nbytes += entry.nbytes
+            self._evict()
+
+    def invalidate(self, path: str) -> None:
+        """Remove the cached config of a file"""
+        with self._lock:
+            self._remove(path)
+
+    def clear(self) -> None:
+        """Remove all cached configs"""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def _remove(self, path: str) -> None:
+        """Remove an entry, the lock must be held"""
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._nbytes -= entry.nbytes
+
+    def _evict(self) -> None:
+        """Evict the least recently used entries, the lock must be held"""
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes and self._nbytes > self.max_bytes)
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._nbytes -= entry.nbytes
+
+
+def copy_config(config: Dict, plain: bool = False) -> Dict:
+    """
+    Copy a config down to its lines, which are immutable and can be shared.
+    This is a lot faster than a deepcopy, as the structure is known. If 'plain'
+    is True, options are copied as plain dicts instead of option nodes.
+    """
+    copy = {}
+    for section, content in config.items():
+        if isinstance(content, list):
+            # the header
+            copy[section] = list(content)
+            continue
+
+        section_copy = copy[section] = {}
+        for key, value in content.items():
+            if key == "_raw":
+                section_copy[key] = value
+            elif key.startswith("#_"):
+                section_copy[key] = list(value)
+            elif plain:
+                section_copy[key] = {
+                    "_raw": value["_raw"],
+                    "value": list(value["value"])
+                    if isinstance(value["value"], list)
+                    else value["value"],
+                }
+            elif isinstance(value["value"], list):
+                section_copy[key] = OptionNode(value["_raw"], list(value["value"]))
+            else:
+                section_copy[key] = OptionNode(value["_raw"], value["value"])
+    return copy
+
+
+def config_size(config: Dict) -> int:
+    """Return the approximate memory size of a config in bytes"""
+    size = sys.getsizeof(config)
+    stack = [*config.keys(), *config.values()]
+    while stack:
+        value = stack.pop()
+        size += sys.getsizeof(value)
+        if isinstance(value, OptionNode):
+            stack.append(value.raw)
+            stack.append(value.value)
+        elif isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return size
+
+
+# the cache consulted by SimpleConfigParser.read_file, disabled by default
+shared_cache = ConfigCache()
+
+
+def configure_shared_cache(max_entries: int, max_bytes: int = 0) -> None:
+    """
+    Enable the cache shared by all parsers of this process, limited to
+    'max_entries' configs and approximately 'max_bytes' bytes, or change its
+    limits. A 'max_entries' of 0 disables the cache.
+    """
+    shared_cache.configure(max_entries, max_bytes)
@@ -48,6 +48,95 @@ LINE_COMMENT_RE = re.compile(r"^\s*[#;].*")
 #  - the line MUST contain only whitespace characters
 EMPTY_LINE_RE = re.compile(r"^\s*$")
 
+# definition of a classified line:
+#  - combines all of the line definitions above into a single expression, so that
+#    the type of a line and its captured values are determined in a single pass
+#  - the alternatives are evaluated in the same order the parser has to evaluate
+#    them: section, option, options block start, empty line, comment
+#  - the name of the matched alternative is the line type (see LINE_* below)
+#  - whitespaces are matched as [^\S\n] so that no alternative ever reaches past
+#    the end of its line, which lets the same definition scan a whole buffer
+_SECTION_LINE_PATTERN = r"\[(?P<section_name>\S.*\S|\S)][^\S\n]*(?:[#;].*)?$"
+_OPTION_LINE_PATTERN = (
+    r"(?P<option>(?P<option_name>[^;#:=\s]+)[^\S\n]?[:=][^\S\n]*"
+    r"(?P<option_value>[^;#:=\s][^;#\n]*?)[^\S\n]*(?:[#;].*)?$)"
+    r"|(?P<options_block_start>(?P<block_name>[^;#:=\s]+)"
+    r"[^\S\n]*[:=][^\S\n]*(?:[#;].*)?$)"
+)
+_LINE_PATTERN = (
+    rf"(?P<section>{_SECTION_LINE_PATTERN})"
+    rf"|{_OPTION_LINE_PATTERN}"
+    r"|(?P<empty>[^\S\n]*$)"
+    r"|(?P<comment>[^\S\n]*[#;])"
+)
+LINE_RE = re.compile(_LINE_PATTERN)
+
+# definitions of a classified line, narrowed down by the first character of
+# the line:
+#  - a section line, only a line starting with "[" can be one. it captures the
+#    same groups as the section alternative of LINE_RE
+#  - an option or options block start, both share the name and the separator,
+#    so the name is scanned only once. a line without a value is an options
+#    block start, a line with a value is an option unless more than one
+#    whitespace precedes the separator (see _classify_line)
+SECTION_LINE_RE = re.compile(rf"(?P<section>{_SECTION_LINE_PATTERN})")
+OPTION_LINE_RE = re.compile(
+    r"(?P<option_name>[^;#:=\s]+)(?P<separator_space>[^\S\n]*)[:=][^\S\n]*"
+    r"(?:(?P<option_value>[^;#:=\s][^;#\n]*?)[^\S\n]*)?(?:[#;].*)?$"
+)
+
+# definition of a scanned line:
+#  - each match covers exactly one line of a buffer, including its newline
+#  - the line type and the captured values are the same as for LINE_RE
+#  - a line that does not match any line definition is of type "other"
+#  - lines are only separated by newline characters
+LINE_SCAN_RE = re.compile(
+    rf"(?!\Z)(?:{_LINE_PATTERN}|(?P<other>))[^\n]*\n?", re.MULTILINE
+)
+
+# definition of a scanned section line:
+#  - same as the section alternative of LINE_SCAN_RE, including the newline
+#  - the expression is not anchored to the start of a line, so that searching a
+#    buffer can skip ahead to the next opening square bracket. matches that do
+#    not start at the beginning of a line have to be ignored
+SECTION_SCAN_RE = re.compile(rf"{_SECTION_LINE_PATTERN}\n?", re.MULTILINE)
+
+# definition of a scanned line in a bytes buffer, e.g. a memory mapped file:
+#  - same as LINE_SCAN_RE, but whitespaces are ASCII whitespaces only
+LINE_SCAN_BYTES_RE = re.compile(LINE_SCAN_RE.pattern.encode(), re.MULTILINE)
+
+# definition of a scanned section line in a bytes buffer:
+#  - same as SECTION_SCAN_RE, but whitespaces are ASCII whitespaces only
+SECTION_SCAN_BYTES_RE = re.compile(SECTION_SCAN_RE.pattern.encode(), re.MULTILINE)
+
+# definition of the start of a possible section line in a bytes buffer:
+#  - an opening square bracket at the beginning of a line
+#  - lines that are not plain ASCII have to be matched against SECTION_SCAN_RE
+#    once they are decoded, as SECTION_SCAN_BYTES_RE only knows ASCII whitespaces
+SECTION_START_BYTES_RE = re.compile(rb"^\[", re.MULTILINE)
+
+# definition of the SAVE_CONFIG header line of a Klipper config:
+#  - the line MUST start with the SAVE_CONFIG prefix "#*#"
+#  - the prefix MUST be followed by "SAVE_CONFIG", enclosed in arrows of any length
+#  - the lines following the header line make up the SAVE_CONFIG block, each of
+#    them starts with the SAVE_CONFIG prefix
+SAVE_CONFIG_HEADER_RE = re.compile(r"^#\*# <-+ SAVE_CONFIG -+>[^\S\n]*$", re.MULTILINE)
+SAVE_CONFIG_PREFIX = "#*#"
+
+# line types as reported by the line classifier
+LINE_SECTION = "section"
+LINE_OPTION = "option"
+LINE_OPTIONS_BLOCK_START = "options_block_start"
+LINE_EMPTY = "empty"
+LINE_COMMENT = "comment"
+
+# names of the groups capturing the name of a section, option or options block
+NAME_GROUPS = {
+    LINE_SECTION: "section_name",
+    LINE_OPTION: "option_name",
+    LINE_OPTIONS_BLOCK_START: "block_name",
+}
+
 BOOLEAN_STATES = {
     "1": True,
     "yes": True,
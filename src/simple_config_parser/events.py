@@ -0,0 +1,120 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import IO, Iterable, Iterator, NamedTuple, Union
+
+from ..simple_config_parser.constants import (
+    LINE_COMMENT,
+    LINE_EMPTY,
+    LINE_OPTION,
+    LINE_OPTIONS_BLOCK_START,
+    LINE_SECTION,
+)
+from ..simple_config_parser.simple_config_parser import SimpleConfigParser
+
+
+class SectionStart(NamedTuple):
+    """A section line"""
+
+    lineno: int
+    raw: str
+    name: str
+
+
+class Option(NamedTuple):
+    """An option line with a value"""
+
+    lineno: int
+    raw: str
+    name: str
+    value: str
+
+
+class BlockStart(NamedTuple):
+    """The first line of a multi-line option"""
+
+    lineno: int
+    raw: str
+    name: str
+
+
+class BlockLine(NamedTuple):
+    """A line of the value of a multi-line option, including its comments"""
+
+    lineno: int
+    raw: str
+    option: str
+
+
+class Comment(NamedTuple):
+    """A comment line outside of a multi-line option"""
+
+    lineno: int
+    raw: str
+
+
+class Blank(NamedTuple):
+    """An empty line outside of a multi-line option"""
+
+    lineno: int
+    raw: str
+
+
+class Unrecognized(NamedTuple):
+    """A line that does not match any line definition and is dropped by the parser"""
+
+    lineno: int
+    raw: str
+
+
+Event = Union[SectionStart, Option, BlockStart, BlockLine, Comment, Blank, Unrecognized]
+
+
+def iter_events(source: Path | str | IO[str] | Iterable[str]) -> Iterator[Event]:
+    """
+    Iterate over the lines of a config file and yield an event for each line.
+    The source is either the path of a config file or an iterable of lines,
+    e.g. a file object opened in text mode. The lines are classified the same
+    way SimpleConfigParser does, but no config is built, so the memory needed
+    does not grow with the size of the config.
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "r") as file:
+            yield from _iter_line_events(file)
+    else:
+        yield from _iter_line_events(source)
+
+
+def _iter_line_events(lines: Iterable[str]) -> Iterator[Event]:
+    """Yield an event for each of the given lines"""
+    classify_line = SimpleConfigParser._classify_line
+    opt_block: str | None = None
+
+    for lineno, line in enumerate(lines, start=1):
+        line_type, name, value = classify_line(line)
+
+        if line_type == LINE_SECTION:
+            opt_block = None
+            yield SectionStart(lineno, line, name)
+        elif line_type == LINE_OPTION:
+            opt_block = None
+            yield Option(lineno, line, name, value)
+        elif line_type == LINE_OPTIONS_BLOCK_START:
+            opt_block = name
+            yield BlockStart(lineno, line, name)
+        elif opt_block is not None:
+            yield BlockLine(lineno, line, opt_block)
+        elif line_type == LINE_EMPTY:
+            yield Blank(lineno, line)
+        elif line_type == LINE_COMMENT:
+            yield Comment(lineno, line)
+        else:
+            yield Unrecognized(lineno, line)
@@ -0,0 +1,192 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+
+from __future__ import annotations
+
+import glob
+import os
+from pathlib import Path
+from typing import Dict, List
+
+from ..simple_config_parser.config_cache import ConfigCache
+from ..simple_config_parser.constants import HEADER_IDENT, LINE_SECTION
+from ..simple_config_parser.simple_config_parser import SimpleConfigParser
+
+INCLUDE_PREFIX = "include "
+
+# a section defined more than once in a file keeps each of its definitions, the
+# later ones under the section name followed by this separator and a number.
+# section names never span more than one line, so this key is never a name
+OCCURRENCE_SEPARATOR = "\n"
+
+
+class IncludeError(Exception):
+    """Raised when an include can not be resolved"""
+
+
+class IncludeResolver:
+    """
+    Resolves the [include ...] sections of Klipper style config files
+
+    Every file is parsed once and kept in a config cache, keyed by its path, of
+    at most 'max_entries' files. A cached file is only parsed again when its
+    mtime or size changed, so resolving configs that share included files, or
+    resolving the same config again, only reads the files that changed since
+    they were last parsed.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self._cache = ConfigCache(max_entries)
+
+    def resolve(self, file: Path | str) -> SimpleConfigParser:
+        """
+        Return a parser holding the effective config of the given file, with
+        all of its includes resolved, the same way Klipper does: An include is
+        replaced by the sections of the included files, in sorted order if the
+        include is a glob. Options of a section that is defined more than once
+        are merged, the last definition of an option wins. Sections keep the
+        position of their first definition. The header is the header of the
+        given file.
+
+        The returned config is a copy, changing it does not affect the cache.
+        """
+        effective = SimpleConfigParser()
+        path = Path(file).resolve()
+        header = self._parse(path, copy=False).get(HEADER_IDENT)
+        if header is not None:
+            effective.config[HEADER_IDENT] = list(header)
+
+        self._merge(effective, path, [])
+        return effective
+
+    def files(self, file: Path | str) -> List[Path]:
+        """
+        Return the given file and all files it includes, directly or through
+        other includes, in the order they are included. A file that is included
+        more than once is only listed once.
+        """
+        files: Dict[Path, None] = {}
+        self._collect(Path(file).resolve(), [], files)
+        return list(files)
+
+    def invalidate(self, file: Path | str | None = None) -> None:
+        """Drop the given file, or all files if no file is given, from the cache"""
+        if file is None:
+            self._cache.clear()
+        else:
+            self._cache.invalidate(str(Path(file).resolve()))
+
+    def _parse(self, path: Path, copy: bool = True) -> Dict:
+        """
+        Return the config of a file, parse the file if it changed. If 'copy' is
+        False, the cached config itself is returned, it must not be changed.
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self._cache.invalidate(str(path))
+            raise
+
+        cached = self._cache.get(str(path), stat.st_mtime_ns, stat.st_size, copy)
+        if cached is not None:
+            return cached[0]
+
+        parser = _FileParser()
+        with open(path, "r") as f:
+            for line in f:
+                parser._parse_line(line)  # noqa
+        state = (
+            parser.current_section,
+            parser.current_opt_block,
+            parser.current_collector,
+        )
+        self._cache.put(str(path), stat.st_mtime_ns, stat.st_size, parser.config, state)
+        return parser.config
+
+    def _merge(
+        self, effective: SimpleConfigParser, path: Path, stack: List[Path]
+    ) -> None:
+        """Merge the sections of a file and its includes into the effective config"""
+        if path in stack:
+            raise IncludeError(f"Recursive include of '{path}'")
+
+        stack.append(path)
+        config = self._parse(path)
+        for key, content in config.items():
+            if key.startswith("#_"):
+                continue
+            section = key.partition(OCCURRENCE_SEPARATOR)[0]
+            if section.startswith(INCLUDE_PREFIX):
+                for include in _expand_include(path, section):
+                    self._merge(effective, include, stack)
+            else:
+                _merge_section(effective, section, content)
+        stack.pop()
+
+    def _collect(self, path: Path, stack: List[Path], files: Dict[Path, None]):
+        """Collect a file and the files it includes"""
+        if path in stack:
+            raise IncludeError(f"Recursive include of '{path}'")
+
+        stack.append(path)
+        files[path] = None
+        for key in self._parse(path, copy=False):
+            section = key.partition(OCCURRENCE_SEPARATOR)[0]
+            if section.startswith(INCLUDE_PREFIX):
+                for include in _expand_include(path, section):
+                    self._collect(include, stack, files)
+        stack.pop()
+
+
+class _FileParser(SimpleConfigParser):
+    """
+    Parses a single file for the resolver. A section that is defined more than
+    once is not replaced by its last definition, every definition is kept, in
+    file order, so that the includes in between them are merged in between them.
+    """
+
+    def _process_line(
+        self, line: str, line_type: str | None, name: str | None, value: str | None
+    ) -> None:
+        if line_type == LINE_SECTION and name in self.config:
+            count = 1
+            while f"{name}{OCCURRENCE_SEPARATOR}{count}" in self.config:
+                count += 1
+            name = f"{name}{OCCURRENCE_SEPARATOR}{count}"
+        super()._process_line(line, line_type, name, value)
+
+
+def _expand_include(path: Path, section: str) -> List[Path]:
+    """
+    Return the files of an include section, relative to the directory of the
+    including file. A glob that matches no file is ignored, a missing file is
+    an error.
+    """
+    pattern = os.path.join(path.parent, section[len(INCLUDE_PREFIX) :].strip())
+    files = sorted(glob.glob(pattern))
+    if not files and not glob.has_magic(pattern):
+        raise IncludeError(f"Include file '{pattern}' does not exist")
+    return [Path(file).resolve() for file in files]
+
+
+def _merge_section(effective: SimpleConfigParser, section: str, content: Dict):
+    """
+    Merge the content of a section into the effective config. The content is
+    a copy taken from the cache, it is moved into the effective config.
+    """
+    target = effective.config.get(section)
+    if target is None:
+        effective.config[section] = content
+        return
+
+    for key, value in content.items():
+        if key == "_raw":
+            continue
+        if key.startswith("#_") and key in target:
+            key = effective._generate_collector_id(target)  # noqa
+        target[key] = value
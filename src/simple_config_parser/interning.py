@@ -0,0 +1,121 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+
+from __future__ import annotations
+
+import sys
+from typing import Dict, Iterable, NamedTuple
+
+from ..simple_config_parser.config_cache import ParseState
+from ..simple_config_parser.constants import HEADER_IDENT
+
+# values longer than this are not interned, long values rarely repeat and
+# interned strings are kept alive for the lifetime of the process
+MAX_INTERNED_VALUE_LENGTH = 32
+
+
+def intern_name(name: str) -> str:
+    """Return the shared instance of a section or option name"""
+    return sys.intern(name)
+
+
+def intern_value(value: str) -> str:
+    """Return the shared instance of a short option value"""
+    if len(value) > MAX_INTERNED_VALUE_LENGTH:
+        return value
+    return sys.intern(value)
+
+
+def intern_config(config: Dict) -> Dict:
+    """
+    Return a config with the same content, but with its section and option
+    names replaced by their shared instances. Unpickling a config, e.g. one
+    parsed in another process, creates new instances of all of its names.
+    """
+    interned: Dict = {}
+    for section, content in config.items():
+        if isinstance(content, list):
+            # the header
+            interned[HEADER_IDENT] = content
+            continue
+
+        interned[intern_name(section)] = {
+            key if key.startswith("#_") else intern_name(key): value
+            for key, value in content.items()
+        }
+    return interned
+
+
+def intern_state(state: ParseState) -> ParseState:
+    """Return a parser state with the shared instances of its names"""
+    section, opt_block, collector = state
+    if section is not None:
+        section = intern_name(section)
+    if opt_block is not None:
+        opt_block = intern_name(opt_block)
+    return section, opt_block, collector
+
+
+class StringReport(NamedTuple):
+    """The memory used by the names and values of one or more configs"""
+
+    # number of name and value strings referenced by the configs
+    strings: int
+    # number of distinct string objects among them
+    objects: int
+    # number of distinct string contents among them
+    unique: int
+    # bytes used by the distinct string objects
+    nbytes: int
+    # bytes that are saved by sharing equal strings, compared to every
+    # reference holding its own copy
+    saved_bytes: int
+    # bytes that could still be saved by sharing the remaining equal strings
+    duplicate_bytes: int
+
+
+def string_report(configs: Iterable[Dict]) -> StringReport:
+    """
+    Report how much memory the section names, option names and single line
+    option values of the given configs use, and how much of it is saved, or
+    could be saved, by sharing equal strings
+    """
+    strings = 0
+    total_bytes = 0
+    objects: Dict[int, int] = {}
+    unique: Dict[str, int] = {}
+
+    def count(string: str) -> None:
+        nonlocal strings, total_bytes
+        size = sys.getsizeof(string)
+        strings += 1
+        total_bytes += size
+        objects[id(string)] = size
+        unique[string] = size
+
+    for config in configs:
+        for section, content in config.items():
+            if isinstance(content, list):
+                continue
+            count(section)
+            for key, value in content.items():
+                if key == "_raw" or key.startswith("#_"):
+                    continue
+                count(key)
+                if isinstance(value["value"], str):
+                    count(value["value"])
+
+    nbytes = sum(objects.values())
+    return StringReport(
+        strings=strings,
+        objects=len(objects),
+        unique=len(unique),
+        nbytes=nbytes,
+        saved_bytes=total_bytes - nbytes,
+        duplicate_bytes=nbytes - sum(unique.values()),
+    )
@@ -0,0 +1,91 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+
+from __future__ import annotations
+
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, List
+
+OPTION_KEYS = ("_raw", "value")
+
+
+class OptionNode(MutableMapping):
+    """
+    An option of a section, holding its raw line and its value. The value of a
+    multiline option is the list of its raw value lines.
+
+    The node is a compact object with two slots, instead of a dict with two
+    keys, but it still behaves like the dict {"_raw": ..., "value": ...}, so
+    options can be accessed as option["_raw"] and option["value"], and compare
+    equal to such a dict. It is not a dict though, isinstance(option, dict) is
+    False and it can not be serialized as JSON, use to_dict for that.
+    """
+
+    __slots__ = ("raw", "value")
+
+    def __init__(self, raw: str, value: str | List[str]) -> None:
+        self.raw = raw
+        self.value = value
+
+    def __getitem__(self, key: str) -> str | List[str]:
+        if key == "value":
+            return self.value
+        if key == "_raw":
+            return self.raw
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: str | List[str]) -> None:
+        if key == "value":
+            self.value = value
+        elif key == "_raw":
+            self.raw = value
+        else:
+            raise KeyError(key)
+
+    def __delitem__(self, key: str) -> None:
+        raise TypeError(f"'{key}' of an option cannot be removed")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(OPTION_KEYS)
+
+    def __len__(self) -> int:
+        return len(OPTION_KEYS)
+
+    def __contains__(self, key: object) -> bool:
+        return key in OPTION_KEYS
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, OptionNode):
+            return self.raw == other.raw and self.value == other.value
+        if isinstance(other, dict):
+            return other == {"_raw": self.raw, "value": self.value}
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr({"_raw": self.raw, "value": self.value})
+
+    def __reduce__(self):
+        return OptionNode, (self.raw, self.value)
+
+    def to_dict(self) -> Dict[str, str | List[str]]:
+        """
+        Return the option as a plain dict, the list of a multiline value is
+        copied. Unlike the node, the dict can be serialized, e.g. as JSON.
+        """
+        value = self.value
+        return {
+            "_raw": self.raw,
+            "value": list(value) if isinstance(value, list) else value,
+        }
+
+    def copy(self) -> OptionNode:
+        """Return a copy of the option, the list of a multiline value is copied"""
+        value = self.value
+        return OptionNode(self.raw, list(value) if isinstance(value, list) else value)
@@ -0,0 +1,166 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+
+from ..simple_config_parser.config_cache import ParseState
+from ..simple_config_parser.interning import (
+    intern_config,
+    intern_name,
+    intern_state,
+)
+from ..simple_config_parser.simple_config_parser import SimpleConfigParser
+
+
+class ParseResult(NamedTuple):
+    """The result of parsing a single file with parse_many"""
+
+    path: Path
+    parser: SimpleConfigParser | None
+    error: Exception | None
+
+
+def parse_many(
+    paths: Iterable[Path | str], workers: int | None = None, **read_options: Any
+) -> List[ParseResult]:
+    """
+    Parse many config files in parallel on a pool of 'workers' processes,
+    which defaults to the number of CPUs. Keyword arguments are passed on to
+    SimpleConfigParser.read_file.
+
+    Returns a ParseResult for each path, in the order of the given paths. If a
+    file could not be read or parsed, its result holds the exception instead
+    of a parser. With one worker, or only one path, the files are parsed in
+    the current process.
+    """
+    paths = [Path(path) for path in paths]
+    workers = workers or os.cpu_count() or 1
+    parse_file = partial(_parse_file, **read_options)
+
+    if workers == 1 or len(paths) <= 1:
+        return [parse_file(path) for path in paths]
+
+    # hand out the paths in chunks, so that the per task overhead of the pool
+    # is spread over several files, while still keeping all workers busy
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+        results = executor.map(parse_file, paths, chunksize=chunksize)
+        return [_intern_result(result) for result in results]
+
+
+def _parse_file(path: Path, **read_options: Any) -> ParseResult:
+    """Parse a single config file, capturing any error"""
+    parser = SimpleConfigParser()
+    try:
+        parser.read_file(path, **read_options)
+    except Exception as e:
+        return ParseResult(path, None, e)
+    return ParseResult(path, parser, None)
+
+
+def _intern_result(result: ParseResult) -> ParseResult:
+    """
+    Replace the names of a parser that was parsed in a worker process by their
+    shared instances, they are new instances after unpickling the parser
+    """
+    parser = result.parser
+    if parser is not None:
+        parser.config = intern_config(parser.config)
+        parser._lazy_sections = {
+            intern_name(name): lazy_section
+            for name, lazy_section in parser._lazy_sections.items()  # noqa
+        }
+        state = (
+            parser.current_section,
+            parser.current_opt_block,
+            parser.current_collector,
+        )
+        parser.current_section, parser.current_opt_block, parser.current_collector = (
+            intern_state(state)
+        )
+    return result
+
+
+def parse_file_parallel(
+    file: Path | str, workers: int | None = None
+) -> SimpleConfigParser:
+    """
+    Parse a single, large config file on a pool of 'workers' processes (see
+    parse_string_parallel)
+    """
+    with open(file, "r") as f:
+        return parse_string_parallel(f.read(), workers)
+
+
+def parse_string_parallel(
+    string: str, workers: int | None = None
+) -> SimpleConfigParser:
+    """
+    Parse a single, large config on a pool of 'workers' processes, which
+    defaults to the number of CPUs. The config is split at its section lines
+    into chunks of about the same size, which are parsed independently. The
+    results are stitched back together in their original order, so the
+    returned parser is the same as if the whole config was parsed at once.
+    """
+    parser = SimpleConfigParser()
+    workers = workers or os.cpu_count() or 1
+    header_end, sections = parser._split_sections(string)  # noqa
+    chunks = _split_chunks(string, header_end, sections, workers * 2)
+
+    if workers == 1 or len(chunks) <= 1:
+        parser.read_string(string)
+        return parser
+
+    # the header is parsed in the meantime, it does not depend on any section
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        results = executor.map(_parse_chunk, chunks)
+        parser.read_string(string[:header_end])
+        for config, state in results:
+            # a section defined in more than one chunk keeps the position of
+            # its first definition, with the content of its last definition.
+            # the names are new instances after unpickling, they are shared again
+            parser.config.update(intern_config(config))
+
+    # the parser ends up in the state after parsing the last chunk
+    parser.current_section, parser.current_opt_block, parser.current_collector = (
+        intern_state(state)
+    )
+    return parser
+
+
+def _split_chunks(
+    string: str,
+    header_end: int,
+    sections: List[Tuple[str, int, int, int]],
+    count: int,
+) -> List[str]:
+    """Split the sections of a string into 'count' chunks of about the same size"""
+    chunk_size = (len(string) - header_end) // count + 1
+    chunks: List[str] = []
+    chunk_start = header_end
+    for _, _, _, end in sections:
+        if end - chunk_start >= chunk_size:
+            chunks.append(string[chunk_start:end])
+            chunk_start = end
+    if chunk_start < len(string):
+        chunks.append(string[chunk_start:])
+    return chunks
+
+
+def _parse_chunk(chunk: str) -> Tuple[Dict, ParseState]:
+    """Parse a chunk of sections and return its config and the final parser state"""
+    parser = SimpleConfigParser()
+    parser.read_string(chunk)
+    state = parser.current_section, parser.current_opt_block, parser.current_collector
+    return parser.config, state
@@ -0,0 +1,144 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Dict
+
+from ..simple_config_parser.config_cache import ParseState
+from ..simple_config_parser.interning import intern_config, intern_state
+from ..simple_config_parser.simple_config_parser import SimpleConfigParser
+
+# bump this whenever the structure of a parsed config or of the parser state
+# changes, so that caches written by an older version are parsed again
+CACHE_VERSION = 2
+
+
+class ParseCache:
+    """
+    A cache of parsed config files in a cache directory
+
+    A parsed file is stored as a pickle of its config and the parser state after
+    parsing it, together with the mtime and size of the file it was parsed from,
+    and optionally a hash of its content. As long as these did not change, the
+    file is loaded from the cache instead of being parsed again, which costs a
+    stat and one unpickle. Only the config and the state are stored, not the
+    parser, so that cache files do not depend on the parser's attributes.
+
+    The cache files are unpickled, so the cache directory must only be writable
+    by trusted users.
+    """
+
+    def __init__(self, cache_dir: Path | str, verify_hash: bool = False) -> None:
+        self.cache_dir = Path(cache_dir)
+        # if True, the content of a file is hashed and compared as well, which
+        # catches changes that keep mtime and size, but reads the whole file
+        self.verify_hash = verify_hash
+
+    def read_file(self, file: Path | str) -> SimpleConfigParser:
+        """
+        Return a parser for the given config file, loaded from the cache if the
+        file did not change since it was cached, otherwise parsed and cached
+        """
+        path = Path(file).resolve()
+        stat = os.stat(path)
+        digest = _hash_file(path) if self.verify_hash else None
+        stamp = (CACHE_VERSION, stat.st_mtime_ns, stat.st_size, digest)
+        cache_file = self._cache_file(path)
+
+        try:
+            with open(cache_file, "rb") as f:
+                # the stamp is stored first, so that the config of an outdated
+                # cache file is not loaded at all
+                if pickle.load(f) == stamp:
+                    config, state = pickle.load(f)
+                    return _load_parser(config, state)
+        except (
+            OSError,
+            pickle.UnpicklingError,
+            EOFError,
+            ValueError,
+            TypeError,
+            AttributeError,
+            ImportError,
+        ):
+            # a missing or unreadable cache file is a cache miss, so is a cache
+            # file that refers to a class that was moved or renamed since
+            pass
+
+        parser = SimpleConfigParser()
+        parser.read_file(path)
+        state = (
+            parser.current_section,
+            parser.current_opt_block,
+            parser.current_collector,
+        )
+        try:
+            self._write(cache_file, stamp, parser.config, state)
+        except OSError:
+            # the file is parsed anyway, a cache that can not be written only
+            # means that it is parsed again next time
+            pass
+        return parser
+
+    def invalidate(self, file: Path | str) -> None:
+        """Remove the cached parser of the given file"""
+        try:
+            os.remove(self._cache_file(Path(file).resolve()))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """Remove all cached parsers"""
+        for cache_file in self.cache_dir.glob("*.pickle"):
+            cache_file.unlink()
+
+    def _cache_file(self, path: Path) -> Path:
+        """Return the cache file of a config file"""
+        name = hashlib.sha256(str(path).encode("utf-8")).hexdigest()
+        return self.cache_dir.joinpath(f"{name}.pickle")
+
+    def _write(self, cache_file: Path, stamp, config: Dict, state: ParseState) -> None:
+        """
+        Write a cache file, the file is replaced atomically, so that concurrent
+        processes never load a partially written file
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(stamp, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump((config, state), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except BaseException:
+            os.remove(tmp_file)
+            raise
+
+
+def _load_parser(config: Dict, state: ParseState) -> SimpleConfigParser:
+    """
+    Return a new parser holding a config loaded from the cache. Unpickling
+    creates new instances of all names, they are replaced by the shared ones.
+    """
+    parser = SimpleConfigParser()
+    parser.config = intern_config(config)
+    parser.current_section, parser.current_opt_block, parser.current_collector = (
+        intern_state(state)
+    )
+    return parser
+
+
+def _hash_file(path: Path) -> str:
+    """Return the hash of the content of a file"""
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
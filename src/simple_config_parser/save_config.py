@@ -0,0 +1,232 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+
+from __future__ import annotations
+
+import io
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from ..simple_config_parser.constants import (
+    SAVE_CONFIG_HEADER_RE,
+    SAVE_CONFIG_PREFIX,
+)
+from ..simple_config_parser.simple_config_parser import (
+    _UNSET,
+    NoOptionError,
+    NoSectionError,
+    SimpleConfigParser,
+)
+
+
+class SaveConfigParser:
+    """
+    A parser for Klipper config files that end with a SAVE_CONFIG block
+
+    The part of the file up to the SAVE_CONFIG header is parsed into 'main'.
+    The lines of the SAVE_CONFIG block are decoded, by removing their "#*#"
+    prefix, and parsed into 'save_config'. The options of the SAVE_CONFIG block
+    override the options of the main config, which is what the get* methods
+    return. Like Klipper, an option of the SAVE_CONFIG block overrides the
+    option of the same name in any case, e.g. "pid_kp" overrides "pid_Kp".
+    """
+
+    def __init__(self) -> None:
+        self.main = SimpleConfigParser()
+        self.save_config = SimpleConfigParser()
+        # the lines of the SAVE_CONFIG block up to its first section, including
+        # the header line, as they were read
+        self.save_config_preamble: List[str] = []
+
+    def read_file(self, file: Path) -> None:
+        """Read and parse a config file"""
+        with open(file, "r") as file:
+            self.read_string(file.read())
+
+    def read_string(self, string: str) -> None:
+        """Read and parse a config from a string"""
+        main, save_config = split_save_config(string)
+        self.main.read_string(main)
+        if not save_config:
+            return
+
+        lines = save_config.splitlines(keepends=True)
+        start = next(
+            (i for i, line in enumerate(lines) if _decode(line).startswith("[")),
+            len(lines),
+        )
+        self.save_config_preamble = lines[:start]
+        self.save_config.read_string("".join(_decode(line) for line in lines[start:]))
+
+    def write_file(self, file: Path) -> None:
+        """Write the main config followed by the SAVE_CONFIG block"""
+        if not file:
+            raise ValueError("No config file specified")
+
+        with open(file, "w") as file:
+            self.main._write_header(file)  # noqa
+            self.main._write_sections(file)  # noqa
+            for line in self.save_config_preamble:
+                file.write(line)
+
+            block = io.StringIO()
+            self.save_config._write_header(block)  # noqa
+            self.save_config._write_sections(block)  # noqa
+            for line in block.getvalue().splitlines(keepends=True):
+                file.write(_encode(line))
+
+    def get_sections(self) -> List[str]:
+        """
+        Return the names of all sections, the sections of the main config first,
+        followed by the sections that are only defined in the SAVE_CONFIG block
+        """
+        sections = self.main.get_sections()
+        known = set(sections)
+        sections.extend(s for s in self.save_config.get_sections() if s not in known)
+        return sections
+
+    def has_section(self, section: str) -> bool:
+        """Check if a section exists in the main config or the SAVE_CONFIG block"""
+        return self.save_config.has_section(section) or self.main.has_section(section)
+
+    def get_options(self, section: str) -> List[str]:
+        """Return the names of all options of a section, including overrides"""
+        if not self.has_section(section):
+            raise NoSectionError(section)
+
+        # keyed by the lowercased name, an override keeps the name of the option
+        # it overrides
+        options: Dict[str, str] = {}
+        for parser in (self.main, self.save_config):
+            if parser.has_section(section):
+                for option in parser.get_options(section):
+                    options.setdefault(option.lower(), option)
+        return list(options.values())
+
+    def has_option(self, section: str, option: str) -> bool:
+        """Check if an option exists in the main config or the SAVE_CONFIG block"""
+        return self._lookup(section, option) is not None
+
+    def is_overridden(self, section: str, option: str) -> bool:
+        """Whether the value of an option is set by the SAVE_CONFIG block"""
+        return self._override(section, option) is not None
+
+    def getval(
+        self, section: str, option: str, fallback: str | _UNSET = _UNSET
+    ) -> str | List[str]:
+        """
+        Return the effective value of the given option in the given section,
+        which is the value of the SAVE_CONFIG block if the option is defined
+        there, otherwise the value of the main config
+
+        If the key is not found and 'fallback' is provided, it is used as
+        a fallback value.
+        """
+        found = self._lookup(section, option)
+        if found is not None:
+            parser, option = found
+            return parser.config[section][option]["value"]
+        if fallback is not _UNSET:
+            return fallback
+        if not self.has_section(section):
+            raise NoSectionError(section)
+        raise NoOptionError(option, section)
+
+    def getint(self, section: str, option: str, fallback: int | _UNSET = _UNSET) -> int:
+        """Return the effective value of the given option as int"""
+        return self._get_conv(section, option, int, fallback=fallback)
+
+    def getfloat(
+        self, section: str, option: str, fallback: float | _UNSET = _UNSET
+    ) -> float:
+        """Return the effective value of the given option as float"""
+        return self._get_conv(section, option, float, fallback=fallback)
+
+    def getboolean(
+        self, section: str, option: str, fallback: bool | _UNSET = _UNSET
+    ) -> bool:
+        """Return the effective value of the given option as boolean"""
+        return self._get_conv(
+            section, option, self.main._convert_to_boolean, fallback=fallback
+        )
+
+    def _get_conv(
+        self,
+        section: str,
+        option: str,
+        conv: Callable[[str], int | float | bool],
+        fallback: _UNSET = _UNSET,
+    ) -> int | float | bool:
+        """
+        Return the effective value of the given option converted by 'conv'. The
+        conversion is done by the parser that holds the value, so that it is
+        memoized there.
+        """
+        found = self._lookup(section, option)
+        if found is None:
+            # returns the fallback or raises the matching error
+            return self.getval(section, option, fallback)
+        parser, option = found
+        return parser._get_conv(section, option, conv, fallback)  # noqa
+
+    def _lookup(
+        self, section: str, option: str
+    ) -> Tuple[SimpleConfigParser, str] | None:
+        """
+        Return the parser that holds the effective value of an option and the
+        name of the option in that parser
+        """
+        override = self._override(section, option)
+        if override is not None:
+            return self.save_config, override
+        if self.main.has_option(section, option):
+            return self.main, option
+        return None
+
+    def _override(self, section: str, option: str) -> str | None:
+        """
+        Return the name of the SAVE_CONFIG option that overrides an option, the
+        names are compared case-insensitively
+        """
+        if not self.save_config.has_section(section):
+            return None
+        if self.save_config.has_option(section, option):
+            return option
+
+        option = option.lower()
+        for name in self.save_config.get_options(section):
+            if name.lower() == option:
+                return name
+        return None
+
+
+def split_save_config(string: str) -> Tuple[str, str]:
+    """
+    Split a config into its main part and its SAVE_CONFIG block, which starts
+    at the SAVE_CONFIG header line. The block is empty if there is no header.
+    """
+    match = SAVE_CONFIG_HEADER_RE.search(string)
+    if match is None:
+        return string, ""
+    return string[: match.start()], string[match.start() :]
+
+
+def _decode(line: str) -> str:
+    """Remove the SAVE_CONFIG prefix of a line"""
+    if line.startswith(SAVE_CONFIG_PREFIX + " "):
+        return line[len(SAVE_CONFIG_PREFIX) + 1 :]
+    if line.startswith(SAVE_CONFIG_PREFIX):
+        return line[len(SAVE_CONFIG_PREFIX) :]
+    return line
+
+
+def _encode(line: str) -> str:
+    """Add the SAVE_CONFIG prefix to a line"""
+    if line.strip():
+        return f"{SAVE_CONFIG_PREFIX} {line}"
+    return SAVE_CONFIG_PREFIX + line
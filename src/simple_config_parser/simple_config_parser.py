@@ -8,24 +8,144 @@
 
 from __future__ import annotations
 
-import secrets
-import string
+import asyncio
+import io
+import mmap
+import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Callable, Dict, List
+from re import Match
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
 
+from ..simple_config_parser.config_cache import ParseState, copy_config, shared_cache
 from ..simple_config_parser.constants import (
     BOOLEAN_STATES,
     EMPTY_LINE_RE,
     HEADER_IDENT,
+    LINE_COMMENT,
     LINE_COMMENT_RE,
+    LINE_EMPTY,
+    LINE_OPTION,
+    LINE_OPTIONS_BLOCK_START,
+    LINE_SCAN_BYTES_RE,
+    LINE_SCAN_RE,
+    LINE_SECTION,
+    NAME_GROUPS,
+    OPTION_LINE_RE,
     OPTION_RE,
     OPTIONS_BLOCK_START_RE,
+    SECTION_LINE_RE,
     SECTION_RE,
+    SECTION_SCAN_BYTES_RE,
+    SECTION_SCAN_RE,
+    SECTION_START_BYTES_RE,
 )
+from ..simple_config_parser.interning import intern_name, intern_value
+from ..simple_config_parser.nodes import OptionNode
 
 _UNSET = object()
 
 
+def _read_text(file: Path) -> str:
+    """Read a whole file in text mode"""
+    with open(file, "r") as f:
+        return f.read()
+
+
+def _write_text(file: Path, text: str, newline: str | None = None) -> None:
+    """Write a whole file in text mode"""
+    with open(file, "w", newline=newline) as f:
+        f.write(text)
+
+
+def section_type(section: str) -> str:
+    """
+    Return the type of a Klipper section, which is the first word of its name,
+    e.g. 'gcode_macro' for 'gcode_macro PRINT_START' and 'stepper_z1' for
+    'stepper_z1'
+    """
+    return section.split(maxsplit=1)[0] if section.strip() else section
+
+
+def _is_option(key: str) -> bool:
+    """Whether a key of a section is an option, and not its raw line or a collector"""
+    return key != "_raw" and not key.startswith("#_")
+
+
+def _match_section_bytes(data: bytes, start: int) -> Tuple[str, int] | None:
+    """
+    Match a section line in UTF-8 encoded bytes at the given offset. Returns the
+    name of the section and the offset of its content, or None if the line is
+    not a section line. Lines that are not plain ASCII are decoded and matched
+    the same way as in text mode.
+    """
+    match = SECTION_SCAN_BYTES_RE.match(data, start)
+    if match is not None and match.group().isascii():
+        return match.group("section_name").decode("utf-8"), match.end()
+
+    end = data.find(b"\n", start) + 1 or len(data)
+    line = data[start:end]
+    if line.isascii():
+        return None
+
+    match = SECTION_SCAN_RE.match(line.decode("utf-8"))
+    if match is None:
+        return None
+    return match.group("section_name"), start + len(match.group().encode("utf-8"))
+
+
+def _decode_span(string: str | bytes, start: int, end: int) -> str:
+    """Return the part of a string, or of UTF-8 encoded bytes, as a string"""
+    content = string[start:end]
+    if isinstance(content, bytes):
+        return content.decode("utf-8")
+    return content
+
+
+def _is_text(string: str | bytes, start: int, end: int, text: str) -> bool:
+    """Whether the part of a string, or of UTF-8 encoded bytes, is the given text"""
+    if isinstance(string, bytes):
+        return string[start:end] == text.encode("utf-8")
+    return len(text) == end - start and string.startswith(text, start)
+
+
+def _classify_indented_line(line: str) -> Tuple[str | None, None, None]:
+    """
+    Classify an empty or indented line. Sections, options and options block
+    starts never start with a whitespace, so such a line is either empty, a
+    comment or a line that can only be part of an options block.
+    """
+    first = line.lstrip()[:1]
+    if not first:
+        return LINE_EMPTY, None, None
+    if first == "#" or first == ";":
+        return LINE_COMMENT, None, None
+    return None, None, None
+
+
+def _option_line_values(match: Match) -> Tuple[str | None, Any, Any]:
+    """Return the line type, the name and the value captured by OPTION_LINE_RE"""
+    name, value = match.group("option_name", "option_value")
+    if value is None:
+        return LINE_OPTIONS_BLOCK_START, name, None
+    if len(match.group("separator_space")) > 1:
+        # an option allows at most one whitespace in front of its separator
+        return None, None, None
+    return LINE_OPTION, name, value
+
+
+def _line_values(match: Match) -> Tuple[str | None, Any, Any]:
+    """Return the line type, the name and the value captured by a line match"""
+    line_type = match.lastgroup
+    if line_type == LINE_OPTION:
+        return line_type, match.group("option_name"), match.group("option_value")
+    if line_type == LINE_SECTION:
+        return line_type, match.group("section_name"), None
+    if line_type == LINE_OPTIONS_BLOCK_START:
+        return line_type, match.group("block_name"), None
+    return line_type, None, None
+
+
 class NoSectionError(Exception):
     """Raised when a section is not defined"""
 
@@ -54,13 +174,43 @@ class NoOptionError(Exception):
 class SimpleConfigParser:
     """A customized config parser targeted at handling Klipper style config files"""
 
-    def __init__(self) -> None:
+    def __init__(self, intern_values: bool = False) -> None:
         self.header: List[str] = []
         self.config: Dict = {}
         self.current_section: str | None = None
         self.current_opt_block: str | None = None
         self.current_collector: str | None = None
         self.in_option_block: bool = False
+        # sections loaded lazily, mapped to the buffer they were read from and
+        # the offsets of their section line, of their not yet parsed content
+        # (everything after the section line) and of their end. the buffer is a
+        # string, or the UTF-8 encoded bytes of a file read in binary mode. the
+        # last item is the section line the section was last written with and
+        # how it was written (see _lazy_section_render), None until then
+        self._lazy_sections: Dict[
+            str, Tuple[str | bytes, int, int, int, Tuple[str, str | None] | None]
+        ] = {}
+        # newline translation when writing files, "" writes the line endings
+        # as they were read, None translates them to the system default
+        self._newline: str | None = None
+        # section and option names are always interned, so that every config
+        # shares a single instance of each name. short option values are only
+        # interned on request, see interning.string_report for the savings
+        self.intern_values: bool = intern_values
+        # converted option values, per section and per option and conversion,
+        # together with the value they were converted from. an entry is only
+        # used while the option still holds that very value, and it is dropped
+        # when the option is changed or removed through the parser's methods
+        self._conv_cache: Dict[str, Dict[Tuple[str, Callable], Tuple[Any, Any]]] = {}
+        # section names by section type, in config order. the index is built on
+        # the first query and kept up to date by add_section and remove_section.
+        # it is dropped when sections are parsed or the config is replaced by the
+        # parser. sections added to or removed from 'config' directly are not
+        # seen by the section type queries
+        self._type_index: Dict[str, Dict[str, None]] | None = None
+        # sections added while a batch of changes is applied, their spacing is
+        # added when the batch ends. None if no batch is active
+        self._batch_sections: List[str] | None = None
 
     def _match_section(self, line: str) -> bool:
         """Wheter or not the given line matches the definition of a section"""
@@ -82,33 +232,78 @@ class SimpleConfigParser:
         """Wheter or not the given line matches the definition of an empty line"""
         return EMPTY_LINE_RE.match(line) is not None
 
+    @staticmethod
+    def _classify_line(line: str) -> Tuple[str | None, str | None, str | None]:
+        """
+        Determine the type of a line and capture its values in a single pass.
+        Returns the line type (one of the LINE_* constants), the name of the
+        section or option and the value of an option. Unused values and the
+        type of a line that does not match any of the line definitions are None.
+
+        Comments, empty lines and indented lines are typed from their first
+        non-blank character without running a regex. The first character also
+        narrows down the expression the other lines are matched against: only
+        a line starting with "[" can be a section, any other line can only be
+        an option or an options block start.
+        """
+        first = line[:1]
+        if first == "[":
+            match = SECTION_LINE_RE.match(line)
+            if match is not None:
+                return LINE_SECTION, match.group("section_name"), None
+        elif first == "#" or first == ";":
+            return LINE_COMMENT, None, None
+        elif first <= " ":
+            return _classify_indented_line(line)
+
+        # anything but the empty string and ASCII whitespaces, the most
+        # common lines, options, take the shortest path
+        match = OPTION_LINE_RE.match(line)
+        if match is not None:
+            return _option_line_values(match)
+        if first.isspace():
+            return _classify_indented_line(line)
+        return None, None, None
+
     def _parse_line(self, line: str) -> None:
         """Parses a line and determines its type"""
-        if self._match_section(line):
+        self._process_line(line, *self._classify_line(line))
+
+    def _process_line(
+        self, line: str, line_type: str | None, name: str | None, value: str | None
+    ) -> None:
+        """Adds a classified line to the config"""
+        if line_type == LINE_SECTION:
+            name = intern_name(name)
+            if self._type_index is not None:
+                self._type_index = None
             self.current_collector = None
             self.current_opt_block = None
-            self.current_section = SECTION_RE.match(line).group(1)
-            self.config[self.current_section] = {"_raw": line}
+            self.current_section = name
+            self.config[name] = {"_raw": line}
+            if self._lazy_sections:
+                self._lazy_sections.pop(name, None)
 
-        elif self._match_option(line):
+        elif line_type == LINE_OPTION:
+            name = intern_name(name)
+            if self.intern_values:
+                value = intern_value(value)
             self.current_collector = None
             self.current_opt_block = None
-            option = OPTION_RE.match(line).group(1)
-            value = OPTION_RE.match(line).group(2)
-            self.config[self.current_section][option] = {"_raw": line, "value": value}
+            self.config[self.current_section][name] = OptionNode(line, value)
 
-        elif self._match_options_block_start(line):
+        elif line_type == LINE_OPTIONS_BLOCK_START:
+            name = intern_name(name)
             self.current_collector = None
-            option = OPTIONS_BLOCK_START_RE.match(line).group(1)
-            self.current_opt_block = option
-            self.config[self.current_section][option] = {"_raw": line, "value": []}
+            self.current_opt_block = name
+            self.config[self.current_section][name] = OptionNode(line, [])
 
         elif self.current_opt_block is not None:
             self.config[self.current_section][self.current_opt_block]["value"].append(
                 line
             )
 
-        elif self._match_empty_line(line) or self._match_line_comment(line):
+        elif line_type == LINE_EMPTY or line_type == LINE_COMMENT:
             self.current_opt_block = None
 
             # if current_section is None, we are at the beginning of the file,
@@ -121,25 +316,420 @@ class SimpleConfigParser:
                 # set the current collector to a new value, so that continuous
                 # empty lines or comments are collected into the same collector
                 if not self.current_collector:
-                    self.current_collector = self._generate_rand_id()
+                    self.current_collector = self._generate_collector_id(section)
                     section[self.current_collector] = []
 
                 section[self.current_collector].append(line)
 
-    def read_file(self, file: Path) -> None:
-        """Read and parse a config file"""
+    def read_file(
+        self,
+        file: Path,
+        use_mmap: bool = False,
+        lazy: bool = False,
+        binary: bool = False,
+    ) -> None:
+        """
+        Read and parse a config file
+
+        If 'use_mmap' is True, the file is memory mapped and scanned in place
+        instead of being read line by line in text mode.
+
+        If 'lazy' is True, only the section lines are parsed on load. The content
+        of a section is parsed the first time it is accessed (see read_string).
+
+        If 'binary' is True, the file is read as UTF-8 encoded bytes and its lines
+        are classified on the raw bytes (see read_bytes). The line endings are
+        kept as they are, also when the file is written again. Together with
+        'lazy', the content of a section is only decoded when it is accessed.
+
+        Memory mapped and binary files are not translated to universal newlines.
+        write_file writes their lines with their original line endings, so that
+        an unchanged config is written back byte for byte.
+
+        If the shared config cache is enabled (see configure_shared_cache), a
+        file read into an empty parser is taken from the cache, as long as the
+        file did not change since it was cached.
+        """
+        if use_mmap and lazy:
+            raise ValueError("A memory mapped file cannot be read lazily")
+
+        if use_mmap:
+            self._read_mmap(file)
+            self._newline = ""
+            return
+
+        if binary:
+            with open(file, "rb") as file:
+                self.read_bytes(file.read(), lazy=lazy)
+            self._newline = ""
+            return
+
+        if lazy:
+            with open(file, "r") as file:
+                self._read_lazy(file.read())
+            return
+
+        if shared_cache.enabled and not self.config:
+            self._read_cached(file)
+            return
+
         with open(file, "r") as file:
             for line in file:
                 self._parse_line(line)
 
-        # print(json.dumps(self.config, indent=4))
+        # print(json.dumps(self.to_dict(), indent=4))
+
+    def _read_cached(self, file: Path) -> None:
+        """Read a config file through the shared config cache"""
+        path = os.path.realpath(file)
+        stat = os.stat(path)
+        cached = shared_cache.get(path, stat.st_mtime_ns, stat.st_size)
+        if cached is not None:
+            self.config, state = cached
+            self._type_index = None
+            self.current_section, self.current_opt_block, self.current_collector = state
+            return
+
+        with open(path, "r") as f:
+            for line in f:
+                self._parse_line(line)
+
+        state = self.current_section, self.current_opt_block, self.current_collector
+        shared_cache.put(path, stat.st_mtime_ns, stat.st_size, self.config, state)
+
+    def _read_mmap(self, file: Path) -> None:
+        """
+        Memory map a UTF-8 encoded config file and scan it in place. Only the
+        lines, names and values that are added to the config are decoded, lines
+        are only separated by newline characters.
+        """
+        with open(file, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                with memoryview(buffer) as view:
+                    self._scan_buffer(buffer, view)
+
+    def _scan_buffer(
+        self, buffer, view: memoryview, start: int = 0, end: int | None = None
+    ) -> None:
+        """
+        Parse all lines of a UTF-8 encoded bytes-like buffer. The bytes
+        expression only knows ASCII whitespaces, so lines that are not plain
+        ASCII are classified again once they are decoded, the same way they
+        are classified in text mode.
+        """
+        process_line = self._process_line
+        classify_line = self._classify_line
+        end = len(buffer) if end is None else end
+        for match in LINE_SCAN_BYTES_RE.finditer(buffer, start, end):
+            start, end = match.span()
+            line = str(view[start:end], "utf-8")
+            if len(line) != end - start:
+                process_line(line, *classify_line(line))
+                continue
+
+            line_type = match.lastgroup
+            name = value = None
+            if line_type in NAME_GROUPS:
+                # group offsets are byte offsets, they can be used to slice the
+                # already decoded line, as it is plain ASCII
+                name_start, name_end = match.span(NAME_GROUPS[line_type])
+                name = line[name_start - start : name_end - start]
+                if line_type == LINE_OPTION:
+                    value_start, value_end = match.span("option_value")
+                    value = line[value_start - start : value_end - start]
+
+            process_line(line, line_type, name, value)
+
+    def read_string(self, string: str, lazy: bool = False) -> None:
+        """
+        Read and parse a config from a string. The whole string is scanned at
+        once, lines are only separated by newline characters.
+
+        If 'lazy' is True, only the section lines are parsed on load and the
+        offsets of their content are recorded. The content of a section is parsed
+        the first time it is accessed through the parser's methods. Until then,
+        the section only holds its '_raw' line in 'config'. The last section is
+        always parsed right away.
+        """
+        if lazy:
+            self._read_lazy(string)
+        else:
+            self._scan_string(string, 0, len(string))
+
+    def read_bytes(
+        self, data: bytes, encoding: str = "utf-8", lazy: bool = False
+    ) -> None:
+        """
+        Read and parse a config from bytes
+
+        UTF-8 encoded bytes are scanned without decoding them as a whole. The
+        lines are classified on the raw bytes, and only the lines that are added
+        to the config are decoded. If 'lazy' is True, the content of a section
+        stays undecoded until it is accessed (see read_string). Other encodings
+        are decoded first and read as a string.
+        """
+        if encoding.lower().replace("_", "-") not in ("utf-8", "utf8"):
+            self.read_string(data.decode(encoding), lazy=lazy)
+        elif lazy:
+            self._read_lazy(data)
+        else:
+            with memoryview(data) as view:
+                self._scan_buffer(data, view)
+
+    def _scan_string(self, string: str | bytes, start: int, end: int) -> None:
+        """
+        Parse all lines of a string, or of UTF-8 encoded bytes, between the given
+        offsets
+        """
+        if isinstance(string, bytes):
+            with memoryview(string) as view:
+                self._scan_buffer(string, view, start, end)
+            return
+
+        process_line = self._process_line
+        for match in LINE_SCAN_RE.finditer(string, start, end):
+            process_line(match.group(), *_line_values(match))
+
+    def _split_sections(
+        self, string: str | bytes
+    ) -> Tuple[int, List[Tuple[str, int, int, int]]]:
+        """
+        Find all section lines of a string, or of UTF-8 encoded bytes. Returns the
+        offset of the first section line and for each section its name, the
+        offsets of its section line and content, and the offset where the
+        section ends.
+        """
+        if isinstance(string, bytes):
+            scan_re, newline = SECTION_START_BYTES_RE, b"\n"
+        else:
+            scan_re, newline = SECTION_SCAN_RE, "\n"
+
+        sections: List[Tuple[str, int, int, int]] = []
+        header_end = len(string)
+        for match in scan_re.finditer(string):
+            start = match.start()
+            if start and string[start - 1 : start] != newline:
+                continue
+
+            if newline == b"\n":
+                section_line = _match_section_bytes(string, start)
+                if section_line is None:
+                    continue
+                name, content_start = section_line
+            else:
+                name, content_start = match.group("section_name"), match.end()
+
+            if sections:
+                prev_name, section_start, prev_content_start, _ = sections[-1]
+                sections[-1] = (prev_name, section_start, prev_content_start, start)
+            else:
+                header_end = start
+
+            sections.append((name, start, content_start, -1))
+
+        if sections:
+            name, section_start, content_start, _ = sections[-1]
+            sections[-1] = (name, section_start, content_start, len(string))
+
+        return header_end, sections
+
+    def _read_lazy(self, string: str | bytes) -> None:
+        """
+        Parse the section lines of a string, or of UTF-8 encoded bytes, and record
+        where their content is
+        """
+        header_end, sections = self._split_sections(string)
+
+        # everything up to the first section is parsed right away
+        self._scan_string(string, 0, header_end)
+
+        for name, start, content_start, end in sections[:-1]:
+            line = string[start:content_start]
+            if isinstance(line, bytes):
+                line = line.decode("utf-8")
+            self._process_line(line, LINE_SECTION, name, None)
+            self._lazy_sections[name] = (string, start, content_start, end, None)
+
+        # the last section is parsed right away, so that the parser ends up in
+        # the same state as after parsing the whole string line by line
+        if sections:
+            _, start, _, end = sections[-1]
+            self._scan_string(string, start, end)
+
+    def reload_file(self, file: Path) -> List[str]:
+        """
+        Read a config file again after it was changed on disk, and only parse
+        the sections that changed (see reload_string)
+        """
+        with open(file, "r", newline=self._newline) as file:
+            return self.reload_string(file.read())
+
+    def reload_string(self, string: str) -> List[str]:
+        """
+        Replace the config with the config of the given string, which usually is
+        a changed version of what was read before. Sections whose content did not
+        change are kept as they are, including their options and collector ids.
+        Only the header and the sections that differ from the current config are
+        parsed again. Returns the names of the sections that were parsed again.
+        """
+        header_end, sections = self._split_sections(string)
+
+        # duplicate sections are kept in the position of their first definition
+        # with the content of their last definition, just like parsing does
+        spans: Dict[str, Tuple[int, int]] = {}
+        for name, start, _, end in sections:
+            spans[name] = (start, end)
+
+        unchanged = {
+            name
+            for name, (start, end) in spans.items()
+            if name in self.config and self._has_text(string, start, end, name)
+        }
+        header = self.config.get(HEADER_IDENT)
+        if header is not None and not self._has_text(string, 0, header_end):
+            header = None
+
+        # the parser state after the last section is taken from parsing its
+        # span, as it can not be told from the content of the section. if the
+        # last section is kept, it is parsed on its own to get the state, and
+        # only kept if that parse has the same keys
+        last_section = sections[-1][0] if sections else None
+        last_state: ParseState | None = None
+        if last_section in unchanged:
+            scratch = SimpleConfigParser()
+            scratch._scan_string(string, *spans[last_section])
+            if last_section in self._lazy_sections or list(
+                scratch.config[last_section]
+            ) == list(self.config[last_section]):
+                last_state = (
+                    scratch.current_section,
+                    scratch.current_opt_block,
+                    scratch.current_collector,
+                )
+            else:
+                unchanged.discard(last_section)
+
+        old_config, old_lazy_sections = self.config, self._lazy_sections
+        self.config, self._lazy_sections = {}, {}
+        self._type_index = None
+        self.current_section = None
+        self.current_opt_block = None
+        self.current_collector = None
+
+        if header is not None:
+            self.config[HEADER_IDENT] = header
+        else:
+            self._scan_string(string, 0, header_end)
+
+        self._conv_cache.clear()
+        changed: List[str] = []
+        for name, (start, end) in spans.items():
+            if name not in unchanged:
+                changed.append(name)
+                self._scan_string(string, start, end)
+                if name == last_section:
+                    last_state = (
+                        self.current_section,
+                        self.current_opt_block,
+                        self.current_collector,
+                    )
+                continue
+
+            self.config[name] = old_config[name]
+            if name in old_lazy_sections:
+                self._lazy_sections[name] = old_lazy_sections[name]
+
+        if last_state is not None:
+            self.current_section, self.current_opt_block, self.current_collector = (
+                last_state
+            )
+
+        return changed
+
+    def _has_text(
+        self, string: str, start: int, end: int, section: str | None = None
+    ) -> bool:
+        """
+        Whether the given section, or the header if no section is given, would be
+        written exactly as the part of the string between the given offsets. A
+        section that was not parsed yet also has the text it was read from.
+        """
+        lazy_section = self._lazy_sections.get(section)
+        if lazy_section is not None:
+            buffer, lazy_start, _, lazy_end, _ = lazy_section
+            if _is_text(string, start, end, _decode_span(buffer, lazy_start, lazy_end)):
+                # parsing the same text results in the same section
+                return True
+
+        text = io.StringIO()
+        if section is None:
+            self._write_header(text)
+        else:
+            self._write_section(text, section)
+        return _is_text(string, start, end, text.getvalue())
+
+    def _get_section(self, section: str) -> Dict:
+        """Return the content of a section, parse it first if it was loaded lazily"""
+        if section in self._lazy_sections:
+            self._parse_lazy_section(section)
+        return self.config[section]
+
+    def _parse_lazy_section(self, section: str) -> None:
+        """Parse the content of a lazily loaded section"""
+        string, _, start, end, _ = self._lazy_sections.pop(section)
+        state = self.current_section, self.current_opt_block, self.current_collector
+        self.current_section = section
+        self.current_opt_block = None
+        self.current_collector = None
+        try:
+            self._scan_string(string, start, end)
+        finally:
+            self.current_section, self.current_opt_block, self.current_collector = state
+
+    async def read_file_async(self, file: Path, yield_every: int = 500) -> None:
+        """
+        Read and parse a config file without blocking the event loop. The file
+        is read in the default executor, the parsing runs on the event loop and
+        yields control to other tasks every 'yield_every' lines.
+        """
+        if yield_every < 1:
+            raise ValueError(f"yield_every must be at least 1, got {yield_every}")
+
+        loop = asyncio.get_running_loop()
+        string = await loop.run_in_executor(None, _read_text, file)
+
+        process_line = self._process_line
+        for count, match in enumerate(LINE_SCAN_RE.finditer(string), start=1):
+            process_line(match.group(), *_line_values(match))
+            if count % yield_every == 0:
+                await asyncio.sleep(0)
+
+    async def write_file_async(self, file: Path) -> None:
+        """
+        Write the current config to the config file without blocking the event
+        loop. The config is serialized on the event loop, so that it can not
+        change while it is written, the file is written in the default executor.
+        """
+        if not file:
+            raise ValueError("No config file specified")
+
+        text = io.StringIO()
+        self._write_header(text)
+        self._write_sections(text)
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, _write_text, file, text.getvalue(), self._newline
+        )
 
     def write_file(self, file: Path) -> None:
         """Write the current config to the config file"""
         if not file:
             raise ValueError("No config file specified")
 
-        with open(file, "w") as file:
+        with open(file, "w", newline=self._newline) as file:
             self._write_header(file)
             self._write_sections(file)
 
@@ -149,10 +739,87 @@ class SimpleConfigParser:
             file.write(line)
 
     def _write_sections(self, file) -> None:
-        """Write the sections to the config file"""
+        """
+        Write the sections to the config file. Consecutive sections that are
+        still unparsed, and that parsing would not change, are written with a
+        single write of the part of the buffer they were read from.
+        """
+        span: Tuple[str | bytes, int, int] | None = None
         for section in self.get_sections():
-            for key, value in self.config[section].items():
-                self._write_section_content(file, key, value)
+            if section not in self._lazy_sections:
+                text = None
+            else:
+                text = self._lazy_section_render(section)
+                if text is None:
+                    string, start, _, end, _ = self._lazy_sections[section]
+                    if span is not None and span[0] is string and span[2] == start:
+                        span = (string, span[1], end)
+                    else:
+                        self._write_span(file, span)
+                        span = (string, start, end)
+                    continue
+
+            self._write_span(file, span)
+            span = None
+            if text is None:
+                self._write_section(file, section)
+            else:
+                file.write(text)
+
+        self._write_span(file, span)
+
+    def _write_span(self, file, span: Tuple[str | bytes, int, int] | None) -> None:
+        """Write a part of a buffer sections were read from to the config file"""
+        if span is None:
+            return
+
+        file.write(_decode_span(*span))
+
+    def _write_section(self, file, section: str) -> None:
+        """Write a section to the config file"""
+        if section in self._lazy_sections:
+            text = self._lazy_section_render(section)
+            if text is None:
+                string, start, _, end, _ = self._lazy_sections[section]
+                text = _decode_span(string, start, end)
+            file.write(text)
+            return
+
+        for key, value in self.config[section].items():
+            self._write_section_content(file, key, value)
+
+    def _lazy_section_render(self, section: str) -> str | None:
+        """
+        Return the text of a section that was not parsed yet, as it is written
+        after parsing it, or None if that is exactly the part of the buffer it
+        was read from. The content of a section can not change while it is not
+        parsed, so the result is kept with the section and only computed again
+        if its section line was replaced.
+        """
+        string, start, content_start, end, render = self._lazy_sections[section]
+        raw = self.config[section]["_raw"]
+        if render is None or render[0] is not raw:
+            text = self._lazy_section_text(section)
+            render = (raw, None if _is_text(string, start, end, text) else text)
+            self._lazy_sections[section] = (string, start, content_start, end, render)
+        return render[1]
+
+    def _lazy_section_text(self, section: str) -> str:
+        """
+        Return the text of a section that was not parsed yet, as it is written
+        after parsing it. Lines that parsing drops, like unknown lines or the
+        first definition of an option that is defined twice, are not part of
+        it. The section stays unparsed.
+        """
+        string, _, start, end, _ = self._lazy_sections[section]
+        scratch = SimpleConfigParser(self.intern_values)
+        scratch.config[section] = dict(self.config[section])
+        scratch.current_section = section
+        scratch._scan_string(string, start, end)
+
+        text = io.StringIO()
+        scratch._write_section(text, section)
+        return text.getvalue()
 
     def _write_section_content(self, file, key, value) -> None:
         """Write the content of a section to the config file"""
@@ -168,33 +835,92 @@ class SimpleConfigParser:
         else:
             file.write(value["_raw"])
 
+    def to_dict(self) -> Dict:
+        """
+        Return a copy of the config made of plain dicts and lists, e.g. to
+        serialize it as JSON. Options are stored as option nodes, which are
+        not dicts. Lazily loaded sections are parsed first.
+        """
+        for section in self.get_sections():
+            self._get_section(section)
+        return copy_config(self.config, plain=True)
+
+    # the config itself is the ordered index of all sections. apart from the
+    # sections, it only holds keys starting with '#_', like the header, so
+    # sections are looked up in the config directly, instead of in a list of
+    # all section names
+
     def get_sections(self) -> List[str]:
         """Return a list of all section names, but exclude any section starting with '#_'"""
-        return list(
-            filter(
-                lambda section: not section.startswith("#_"),
-                self.config.keys(),
-            )
-        )
+        return [section for section in self.config if not section.startswith("#_")]
 
     def has_section(self, section: str) -> bool:
         """Check if a section exists"""
-        return section in self.get_sections()
+        return section in self.config and not section.startswith("#_")
+
+    def _last_section(self) -> str | None:
+        """Return the name of the last section, or None if there is no section"""
+        for section in reversed(self.config):
+            if not section.startswith("#_"):
+                return section
+        return None
 
     def add_section(self, section: str) -> None:
         """Add a new section to the config"""
-        if section in self.get_sections():
+        if self.has_section(section):
             raise DuplicateSectionError(section)
 
-        if len(self.get_sections()) >= 1:
-            self._check_set_section_spacing()
+        if self._batch_sections is not None:
+            # the spacing is added once, when the batch ends
+            self._batch_sections.append(section)
+        else:
+            last_section = self._last_section()
+            if last_section is not None:
+                self._check_set_section_spacing(last_section)
 
         self.config[section] = {"_raw": f"[{section}]\n"}
+        if self._type_index is not None:
+            self._type_index.setdefault(section_type(section), {})[section] = None
+
+    def get_sections_of_type(self, type_name: str) -> List[str]:
+        """
+        Return the names of all sections of the given type, e.g. all
+        'gcode_macro' sections, in the order they appear in the config. Only
+        sections added and removed through the parser's methods are seen.
+        """
+        return list(self._get_type_index().get(type_name, ()))
 
-    def _check_set_section_spacing(self):
-        prev_section_name: str = self.get_sections()[-1]
-        prev_section_content: Dict = self.config[prev_section_name]
-        last_option_name: str = list(prev_section_content.keys())[-1]
+    def get_sections_with_prefix(self, prefix: str) -> List[str]:
+        """
+        Return the names of all sections starting with the given prefix, e.g.
+        'stepper_' or 'temperature_sensor ', grouped by section type in the
+        order the types first appear in the config
+        """
+        sections: List[str] = []
+        for type_name, names in self._get_type_index().items():
+            if type_name.startswith(prefix):
+                sections.extend(names)
+            elif prefix.startswith(type_name):
+                sections.extend(name for name in names if name.startswith(prefix))
+        return sections
+
+    def get_section_types(self) -> List[str]:
+        """Return all section types, in the order they first appear in the config"""
+        return list(self._get_type_index())
+
+    def _get_type_index(self) -> Dict[str, Dict[str, None]]:
+        """Return the section type index, build it if needed"""
+        index = self._type_index
+        if index is None:
+            index = {}
+            for section in self.get_sections():
+                index.setdefault(section_type(section), {})[section] = None
+            self._type_index = index
+        return index
+
+    def _check_set_section_spacing(self, prev_section_name: str):
+        prev_section_content: Dict = self._get_section(prev_section_name)
+        last_option_name: str = next(reversed(prev_section_content))
 
         if last_option_name.startswith("#_"):
             last_elem_value: str = prev_section_content[last_option_name][-1]
@@ -211,24 +937,34 @@ class SimpleConfigParser:
             if last_elem_value != "\n":
                 prev_section_content[last_option_name].append("\n")
         else:
-            prev_section_content[self._generate_rand_id()] = ["\n"]
+            collector = self._generate_collector_id(prev_section_content)
+            prev_section_content[collector] = ["\n"]
 
     def remove_section(self, section: str) -> None:
         """Remove a section from the config"""
-        self.config.pop(section, None)
+        index = self._type_index
+        if self.config.pop(section, None) is not None and index is not None:
+            sections = index.get(section_type(section), {})
+            sections.pop(section, None)
+            if not sections:
+                index.pop(section_type(section), None)
+        self._lazy_sections.pop(section, None)
+        self._conv_cache.pop(section, None)
+
+    # the content of a section is the index of its options in the same way, it
+    # only holds the raw section line and the collectors besides the options
 
     def get_options(self, section: str) -> List[str]:
         """Return a list of all option names for a given section"""
-        return list(
-            filter(
-                lambda option: option != "_raw" and not option.startswith("#_"),
-                self.config[section].keys(),
-            )
-        )
+        return [option for option in self._get_section(section) if _is_option(option)]
 
     def has_option(self, section: str, option: str) -> bool:
         """Check if an option exists in a section"""
-        return self.has_section(section) and option in self.get_options(section)
+        return (
+            self.has_section(section)
+            and _is_option(option)
+            and option in self._get_section(section)
+        )
 
     def set_option(self, section: str, option: str, value: str | List[str]) -> None:
         """
@@ -238,22 +974,86 @@ class SimpleConfigParser:
         if not self.has_section(section):
             self.add_section(section)
 
-        if not self.has_option(section, option):
-            self.config[section][option] = {
-                "_raw": f"{option}:\n"
-                if isinstance(value, list)
-                else f"{option}: {value}\n",
-                "value": value,
-            }
+        self._invalidate_conv(section, option)
+        self._set_value(self._get_section(section), option, value)
+
+    def set_many(self, items: Iterable[Tuple[str, str, str | List[str]]]) -> None:
+        """
+        Set the values of many options, given as (section, option, value)
+        tuples, like set_option does. The changes are applied as one batch,
+        see batch.
+        """
+        with self.batch():
+            contents: Dict[str, Dict] = {}
+            conv_cache = self._conv_cache
+            for section, option, value in items:
+                content = contents.get(section)
+                if content is None:
+                    if not self.has_section(section):
+                        self.add_section(section)
+                    content = contents[section] = self._get_section(section)
+                if section in conv_cache:
+                    self._invalidate_conv(section, option)
+                self._set_value(content, option, value)
+
+    @contextmanager
+    def batch(self) -> Iterator[SimpleConfigParser]:
+        """
+        Apply many changes as one batch. Sections added within the batch are
+        not separated from the section before them right away, the blank lines
+        between them are added once, when the batch ends, so the options set
+        within the batch end up before them. Batches can be nested, the
+        outermost batch applies the spacing.
+        """
+        if self._batch_sections is not None:
+            yield self
+            return
+
+        self._batch_sections = []
+        try:
+            yield self
+        finally:
+            sections, self._batch_sections = self._batch_sections, None
+            self._set_batch_spacing(sections)
+
+    def _set_batch_spacing(self, sections: List[str]) -> None:
+        """Separate the sections added within a batch from the section before them"""
+        if not sections:
+            return
+
+        added = set(sections)
+        prev_section: str | None = None
+        for section in self.config:
+            if section.startswith("#_"):
+                continue
+            if section in added and prev_section is not None:
+                self._check_set_section_spacing(prev_section)
+            prev_section = section
+
+    def _set_value(self, content: Dict, option: str, value: str | List[str]) -> None:
+        """Set the value of an option in the content of a section"""
+        opt = content.get(option) if _is_option(option) else None
+        if opt is None:
+            content[option] = OptionNode(
+                f"{option}:\n" if isinstance(value, list) else f"{option}: {value}\n",
+                value,
+            )
         else:
-            opt = self.config[section][option]
             if not isinstance(value, list):
                 opt["_raw"] = opt["_raw"].replace(opt["value"], value)
             opt["value"] = value
 
     def remove_option(self, section: str, option: str) -> None:
         """Remove an option from a section"""
-        self.config[section].pop(option, None)
+        self._get_section(section).pop(option, None)
+        self._invalidate_conv(section, option)
+
+    def _invalidate_conv(self, section: str, option: str) -> None:
+        """Drop the converted values of an option"""
+        cache = self._conv_cache.get(section)
+        if cache:
+            for key in [key for key in cache if key[0] == option]:
+                del cache[key]
 
     def getval(
         self, section: str, option: str, fallback: str | _UNSET = _UNSET
@@ -265,11 +1065,12 @@ class SimpleConfigParser:
         a fallback value.
         """
         try:
-            if section not in self.get_sections():
+            if not self.has_section(section):
                 raise NoSectionError(section)
-            if option not in self.get_options(section):
+            content = self._get_section(section)
+            if option not in content or not _is_option(option):
                 raise NoOptionError(option, section)
-            return self.config[section][option]["value"]
+            return content[option]["value"]
         except (NoSectionError, NoOptionError):
             if fallback is _UNSET:
                 raise
@@ -309,17 +1110,126 @@ class SimpleConfigParser:
         fallback: _UNSET = _UNSET,
     ) -> int | float | bool:
         """Return the value of the given option in the given section as a converted value"""
+        cache = self._conv_cache.get(section)
+        if cache is not None:
+            cached = cache.get((option, conv))
+            if cached is not None and cached[0] is self._current_value(section, option):
+                return cached[1]
+
+        value = self.getval(section, option, fallback)
+        return self._convert(section, option, value, conv, fallback)
+
+    def _convert(
+        self,
+        section: str,
+        option: str,
+        value: str | List[str],
+        conv: Callable[[str], int | float | bool],
+        fallback: _UNSET = _UNSET,
+    ) -> int | float | bool:
+        """Convert the value of an option, or a fallback value, and cache the result"""
         try:
-            return conv(self.getval(section, option, fallback))
+            converted = conv(value)
         except (ValueError, TypeError, AttributeError) as e:
             if fallback is not _UNSET:
                 return fallback
-            raise ValueError(
-                f"Cannot convert {self.getval(section, option)} to {conv.__name__}"
-            ) from e
-
-    def _generate_rand_id(self) -> str:
-        """Generate a random id with 6 characters"""
-        chars = string.ascii_letters + string.digits
-        rand_string = "".join(secrets.choice(chars) for _ in range(12))
-        return f"#_{rand_string}"
+            raise ValueError(f"Cannot convert {value} to {conv.__name__}") from e
+
+        # fallback values are not cached, only the values of existing options
+        if value is not fallback:
+            self._conv_cache.setdefault(section, {})[(option, conv)] = (
+                value,
+                converted,
+            )
+        return converted
+
+    def get_many(
+        self, pairs: Iterable[Tuple[str, str]], fallback: Any = _UNSET
+    ) -> List[str | List[str]]:
+        """
+        Return the values of many options at once, one value for each pair of
+        section and option, in the order of the pairs. Every section is looked up
+        only once.
+
+        If an option is not found and 'fallback' is provided, it is used as
+        a fallback value.
+        """
+        return self._get_many(pairs, None, fallback)
+
+    def getint_many(
+        self, pairs: Iterable[Tuple[str, str]], fallback: Any = _UNSET
+    ) -> List[int]:
+        """Return the values of many options at once as ints (see get_many)"""
+        return self._get_many(pairs, int, fallback)
+
+    def getfloat_many(
+        self, pairs: Iterable[Tuple[str, str]], fallback: Any = _UNSET
+    ) -> List[float]:
+        """Return the values of many options at once as floats (see get_many)"""
+        return self._get_many(pairs, float, fallback)
+
+    def getboolean_many(
+        self, pairs: Iterable[Tuple[str, str]], fallback: Any = _UNSET
+    ) -> List[bool]:
+        """Return the values of many options at once as booleans (see get_many)"""
+        return self._get_many(pairs, self._convert_to_boolean, fallback)
+
+    def _get_many(
+        self,
+        pairs: Iterable[Tuple[str, str]],
+        conv: Callable[[str], int | float | bool] | None,
+        fallback: Any,
+    ) -> List[Any]:
+        """Return the values of many options, converted by 'conv' if given"""
+        values: List[Any] = []
+        append = values.append
+        contents: Dict[str, Dict | None] = {}
+        conv_cache = self._conv_cache
+        for section, option in pairs:
+            if section in contents:
+                content = contents[section]
+            else:
+                content = (
+                    self._get_section(section) if self.has_section(section) else None
+                )
+                contents[section] = content
+
+            node = content.get(option) if content is not None else None
+            if node is None or option == "_raw" or option.startswith("#_"):
+                if fallback is _UNSET:
+                    if content is None:
+                        raise NoSectionError(section)
+                    raise NoOptionError(option, section)
+                value = fallback
+            elif type(node) is OptionNode:
+                value = node.value
+            else:
+                value = node["value"]
+
+            if conv is not None:
+                cache = conv_cache.get(section)
+                cached = cache.get((option, conv)) if cache else None
+                if cached is not None and cached[0] is value:
+                    value = cached[1]
+                else:
+                    value = self._convert(section, option, value, conv, fallback)
+            append(value)
+        return values
+
+    def _current_value(self, section: str, option: str) -> Any:
+        """Return the value an option holds right now, or None if there is none"""
+        try:
+            return self.config[section][option]["value"]
+        except (KeyError, TypeError):
+            return None
+
+    def _generate_collector_id(self, section: Dict) -> str:
+        """
+        Generate the id of a new collector in the given section content. The id
+        is the position of the collector in the section, so parsing the same
+        config always produces the same ids.
+        """
+        position = len(section)
+        while f"#_{position}" in section:
+            position += 1
+        return f"#_{position}"
@@ -0,0 +1,108 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+
+from pathlib import Path
+
+import pytest
+
+from src.simple_config_parser import simple_config_parser as scp
+from src.simple_config_parser.constants import (
+    LINE_COMMENT,
+    LINE_EMPTY,
+    LINE_OPTION,
+    LINE_OPTIONS_BLOCK_START,
+    LINE_RE,
+    LINE_SECTION,
+    OPTION_RE,
+    OPTIONS_BLOCK_START_RE,
+    SECTION_RE,
+)
+from src.simple_config_parser.simple_config_parser import SimpleConfigParser
+from tests.utils import load_testdata_from_file
+
+LINE_MATCHING_DIR = Path(__file__).parent.parent
+ASSETS_DIR = LINE_MATCHING_DIR.parent.joinpath("assets")
+TEST_DATA_PATHS = sorted(LINE_MATCHING_DIR.glob("*/test_data/*.txt")) + sorted(
+    ASSETS_DIR.iterdir()
+)
+TEST_LINES = list(
+    dict.fromkeys(
+        line for path in TEST_DATA_PATHS for line in load_testdata_from_file(path)
+    )
+)
+
+
+@pytest.fixture
+def parser():
+    return SimpleConfigParser()
+
+
+def sequential_line_type(parser, line):
+    """Determine the line type the way the parser did before the classifier"""
+    if parser._match_section(line):
+        return LINE_SECTION, SECTION_RE.match(line).group(1)
+    if parser._match_option(line):
+        return LINE_OPTION, OPTION_RE.match(line).group(1, 2)
+    if parser._match_options_block_start(line):
+        return LINE_OPTIONS_BLOCK_START, OPTIONS_BLOCK_START_RE.match(line).group(1)
+    if parser._match_empty_line(line):
+        return LINE_EMPTY, None
+    if parser._match_line_comment(line):
+        return LINE_COMMENT, None
+    return None, None
+
+
+def classified_line_type(parser, line):
+    line_type, name, value = parser._classify_line(line)
+    if line_type == LINE_OPTION:
+        return line_type, (name, value)
+    return line_type, name
+
+
+@pytest.mark.parametrize("line", TEST_LINES)
+def test_classify_line(parser, line):
+    """Test that the classifier agrees with the individual line definitions"""
+    for variant in (line, f"{line}\n"):
+        assert classified_line_type(parser, variant) == sequential_line_type(
+            parser, variant
+        ), f"Classification of line '{variant}' differs!"
+
+
+def test_classify_unknown_line(parser):
+    assert parser._classify_line("  indented_value") == (None, None, None)
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("# comment\n", LINE_COMMENT),
+        ("; comment", LINE_COMMENT),
+        ("   # indented comment\n", LINE_COMMENT),
+        ("\n", LINE_EMPTY),
+        ("", LINE_EMPTY),
+        (" \t \n", LINE_EMPTY),
+        ("  indented_value\n", None),
+    ],
+)
+def test_classify_line_without_regex(parser, monkeypatch, line, expected):
+    """Test that lines typed by their first character never reach a regex"""
+    monkeypatch.setattr(scp, "SECTION_LINE_RE", None)
+    monkeypatch.setattr(scp, "OPTION_LINE_RE", None)
+    assert parser._classify_line(line) == (expected, None, None)
+
+
+@pytest.mark.parametrize("config_file", sorted(p.name for p in ASSETS_DIR.iterdir()))
+def test_classify_line_like_line_re(parser, config_file):
+    """Test that the first character dispatch agrees with LINE_RE"""
+    lines = ASSETS_DIR.joinpath(config_file).read_text().splitlines(keepends=True)
+    lines += ["[a:b]\n", "[a]x: 1\n", "[a] ; c\n", "[\n", "\xa0# c\n", "\u2003\n"]
+    lines += ["a  : 1\n", "a  :\n", "a\t= 1\n", "a: :1\n", "a:1 ; c\n", "a: # c\n"]
+    for line in lines:
+        match = LINE_RE.match(line)
+        expected = (None, None, None) if match is None else scp._line_values(match)
+        assert parser._classify_line(line) == expected, line
@@ -0,0 +1,100 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+import io
+from pathlib import Path
+
+import pytest
+
+from src.simple_config_parser.events import (
+    Blank,
+    BlockLine,
+    BlockStart,
+    Comment,
+    Option,
+    SectionStart,
+    Unrecognized,
+    iter_events,
+)
+from src.simple_config_parser.simple_config_parser import SimpleConfigParser
+
+BASE_DIR = Path(__file__).parent.parent.joinpath("assets")
+TEST_DATA_PATH = BASE_DIR.joinpath("test_config_1.cfg")
+CONFIG_FILES = [
+    "test_config_1.cfg",
+    "test_config_2.cfg",
+    "test_config_3.cfg",
+    "klipper_config.txt",
+]
+
+
+@pytest.mark.parametrize("config_file", CONFIG_FILES)
+def test_iter_events_raw_lines(config_file):
+    file_path = BASE_DIR.joinpath(config_file)
+    events = list(iter_events(file_path))
+
+    assert [event.lineno for event in events] == list(range(1, len(events) + 1))
+    assert "".join(event.raw for event in events) == file_path.read_text()
+
+
+@pytest.mark.parametrize("config_file", CONFIG_FILES)
+def test_iter_events_match_parser(config_file):
+    file_path = BASE_DIR.joinpath(config_file)
+    parser = SimpleConfigParser()
+    parser.read_file(file_path)
+
+    values = {}
+    section = None
+    for event in iter_events(str(file_path)):
+        if isinstance(event, SectionStart):
+            section = values[event.name] = {}
+        elif isinstance(event, Option):
+            section[event.name] = event.value
+        elif isinstance(event, BlockStart):
+            section[event.name] = []
+        elif isinstance(event, BlockLine):
+            section[event.option].append(event.raw)
+
+    for name in parser.get_sections():
+        assert values[name] == {
+            option: parser.getval(name, option) for option in parser.get_options(name)
+        }
+
+
+def test_iter_events_types():
+    events = iter_events(TEST_DATA_PATH)
+    assert [type(event) for event in events][22:32] == [
+        Blank,
+        SectionStart,
+        Comment,
+        Option,
+        BlockStart,
+        BlockLine,
+        BlockLine,
+        BlockLine,
+        BlockLine,
+        Option,
+    ]
+
+
+def test_iter_events_stream():
+    stream = io.StringIO("[section]\noption:\n\n  value\n  : invalid\n")
+    assert list(iter_events(stream)) == [
+        SectionStart(1, "[section]\n", "section"),
+        BlockStart(2, "option:\n", "option"),
+        BlockLine(3, "\n", "option"),
+        BlockLine(4, "  value\n", "option"),
+        BlockLine(5, "  : invalid\n", "option"),
+    ]
+
+
+def test_iter_events_unrecognized():
+    events = list(iter_events(["[section]\n", "  value\n", "# comment\n"]))
+    assert events[1:] == [
+        Unrecognized(2, "  value\n"),
+        Comment(3, "# comment\n"),
+    ]
@@ -60,3 +60,30 @@ def test_collector_parsing(parser):
     assert isinstance(collector, list)
     assert len(collector) > 0
     assert "; comment" in collector
+
+
+def test_collector_ids_are_deterministic():
+    config = TEST_DATA_PATH.read_text()
+    parser1 = SimpleConfigParser()
+    parser1.read_string(config)
+    parser2 = SimpleConfigParser()
+    parser2.read_file(TEST_DATA_PATH)
+    parser3 = SimpleConfigParser()
+    parser3.read_string(config, lazy=True)
+    for section in parser3.get_sections():
+        parser3.get_options(section)
+
+    assert parser1.config == parser2.config
+    assert parser1.config == parser3.config
+
+
+def test_collector_ids_are_unique():
+    parser = SimpleConfigParser()
+    parser.read_string("[section]\n# comment\noption_1: 1\n\noption_2: 2\n")
+    keys = ["_raw", "#_1", "option_1", "#_3", "option_2"]
+    assert list(parser.config["section"]) == keys
+
+    parser.remove_option("section", "option_1")
+    parser.add_section("other")
+    keys = ["_raw", "#_1", "#_3", "option_2", "#_4"]
+    assert list(parser.config["section"]) == keys
@@ -0,0 +1,74 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from src.simple_config_parser.simple_config_parser import (
+    SimpleConfigParser,
+)
+
+BASE_DIR = Path(__file__).parent.parent.joinpath("assets")
+TEST_DATA_PATH = BASE_DIR.joinpath("test_config_1.cfg")
+KLIPPER_CONFIG_PATH = BASE_DIR.joinpath("klipper_config.txt")
+
+
+@pytest.mark.parametrize("file_path", [TEST_DATA_PATH, KLIPPER_CONFIG_PATH])
+def test_read_file_async(file_path):
+    parser1 = SimpleConfigParser()
+    parser1.read_file(file_path)
+
+    parser2 = SimpleConfigParser()
+    asyncio.run(parser2.read_file_async(file_path))
+
+    assert parser1.config == parser2.config
+
+
+def test_read_file_async_yields():
+    ticks = []
+
+    async def tick():
+        while True:
+            ticks.append(len(ticks))
+            await asyncio.sleep(0)
+
+    async def read():
+        task = asyncio.create_task(tick())
+        await asyncio.sleep(0)
+        parser = SimpleConfigParser()
+        await parser.read_file_async(KLIPPER_CONFIG_PATH, yield_every=100)
+        task.cancel()
+
+    asyncio.run(read())
+    # the file has 1337 lines, so the parser yielded at least 13 times
+    assert len(ticks) >= 13
+
+
+@pytest.mark.parametrize("yield_every", [0, -1])
+def test_read_file_async_invalid_yield_every(yield_every):
+    parser = SimpleConfigParser()
+    with pytest.raises(ValueError):
+        asyncio.run(parser.read_file_async(TEST_DATA_PATH, yield_every=yield_every))
+
+    assert parser.get_sections() == []
+
+
+def test_write_file_async(tmp_path):
+    tmp_file = Path(tmp_path).joinpath("tmp_config.cfg")
+    parser = SimpleConfigParser()
+    parser.read_file(TEST_DATA_PATH)
+    asyncio.run(parser.write_file_async(tmp_file))
+
+    assert tmp_file.read_text() == TEST_DATA_PATH.read_text()
+
+
+def test_write_file_async_exception():
+    parser = SimpleConfigParser()
+    with pytest.raises(ValueError):
+        asyncio.run(parser.write_file_async(None))  # noqa
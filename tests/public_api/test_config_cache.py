@@ -0,0 +1,141 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.simple_config_parser.config_cache import (
+    ConfigCache,
+    configure_shared_cache,
+    shared_cache,
+)
+from src.simple_config_parser.simple_config_parser import (
+    SimpleConfigParser,
+)
+
+BASE_DIR = Path(__file__).parent.parent.joinpath("assets")
+TEST_DATA_PATH = BASE_DIR.joinpath("test_config_1.cfg")
+
+
+@pytest.fixture
+def cache():
+    configure_shared_cache(max_entries=8)
+    yield shared_cache
+    configure_shared_cache(max_entries=0)
+    shared_cache.clear()
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    config_file = Path(tmp_path).joinpath("printer.cfg")
+    shutil.copy(TEST_DATA_PATH, config_file)
+    return config_file
+
+
+def _fail_parsing(monkeypatch):
+    def parse_line(*args, **kwargs):
+        raise AssertionError("file was parsed")
+
+    monkeypatch.setattr(SimpleConfigParser, "_parse_line", parse_line)
+
+
+def test_cache_disabled_by_default(config_file):
+    parser = SimpleConfigParser()
+    parser.read_file(config_file)
+    assert len(shared_cache) == 0
+
+
+def test_read_file_cached(cache, config_file, monkeypatch):
+    parser1 = SimpleConfigParser()
+    parser1.read_file(config_file)
+
+    _fail_parsing(monkeypatch)
+    parser2 = SimpleConfigParser()
+    parser2.read_file(config_file)
+
+    assert parser2.config == parser1.config
+    assert parser2.current_section == parser1.current_section
+    assert parser2.current_collector == parser1.current_collector
+    assert cache.hits == 1
+
+
+def test_cached_configs_are_independent(cache, config_file):
+    parser1 = SimpleConfigParser()
+    parser1.read_file(config_file)
+    parser1.set_option("section_1", "option_1", "changed")
+    parser1.getval("section_1", "option_1")
+
+    parser2 = SimpleConfigParser()
+    parser2.read_file(config_file)
+    parser2.config["section_2"]["option_2"]["value"] = "changed"
+    assert parser2.getval("section_1", "option_1") == "value_1"
+
+    parser3 = SimpleConfigParser()
+    parser3.read_file(config_file)
+    assert parser3.getval("section_2", "option_2") == "value_2"
+
+
+def test_changed_file_is_parsed_again(cache, config_file):
+    SimpleConfigParser().read_file(config_file)
+    config_file.write_text("[section_1]\noption_1: changed\n")
+
+    parser = SimpleConfigParser()
+    parser.read_file(config_file)
+    assert parser.getval("section_1", "option_1") == "changed"
+
+
+def test_non_empty_parser_bypasses_cache(cache, config_file):
+    parser = SimpleConfigParser()
+    parser.read_string("[section_0]\noption_0: value_0\n")
+    parser.read_file(config_file)
+
+    assert parser.get_sections()[0] == "section_0"
+    assert len(cache) == 0
+
+
+def test_lru_eviction():
+    cache = ConfigCache(max_entries=2)
+    for path in ("a", "b", "c"):
+        cache.put(path, 0, 0, {}, (None, None, None))
+    assert cache.get("a", 0, 0) is None
+    assert cache.get("b", 0, 0) is not None
+
+    cache.put("d", 0, 0, {}, (None, None, None))
+    assert cache.get("c", 0, 0) is None
+    assert cache.get("b", 0, 0) is not None
+
+
+def test_byte_size_limit():
+    parser = SimpleConfigParser()
+    parser.read_file(TEST_DATA_PATH)
+    state = (None, None, None)
+
+    cache = ConfigCache(max_entries=8)
+    cache.put("a", 0, 0, parser.config, state)
+    nbytes = cache.nbytes
+    assert nbytes > 0
+
+    cache.configure(max_entries=8, max_bytes=nbytes * 2)
+    cache.put("b", 0, 0, parser.config, state)
+    cache.put("c", 0, 0, parser.config, state)
+    assert len(cache) == 2
+    assert cache.nbytes <= nbytes * 2
+    assert cache.get("a", 0, 0) is None
+
+
+def test_get_without_copy():
+    parser = SimpleConfigParser()
+    parser.read_file(TEST_DATA_PATH)
+    cache = ConfigCache(max_entries=8)
+    cache.put("a", 0, 0, parser.config, (None, None, None))
+
+    config, _ = cache.get("a", 0, 0, copy=False)
+    assert config is cache.get("a", 0, 0, copy=False)[0]
+    assert config is not cache.get("a", 0, 0)[0]
+    assert config == parser.config
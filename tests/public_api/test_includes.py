@@ -0,0 +1,132 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from pathlib import Path
+
+import pytest
+
+from src.simple_config_parser.includes import IncludeError, IncludeResolver
+
+
+@pytest.fixture
+def printer_cfg(tmp_path):
+    macros = Path(tmp_path).joinpath("macros")
+    macros.mkdir()
+    macros.joinpath("b.cfg").write_text("[gcode_macro B]\ngcode:\n  M117 B\n")
+    macros.joinpath("a.cfg").write_text("[gcode_macro A]\ngcode:\n  M117 A\n")
+    tmp_path.joinpath("stepper.cfg").write_text(
+        "[stepper_x]\nstep_pin: PF0\nposition_max: 200\n"
+    )
+    printer_cfg = tmp_path.joinpath("printer.cfg")
+    printer_cfg.write_text(
+        "# printer\n"
+        "[include stepper.cfg]\n"
+        "[include macros/*.cfg]\n"
+        "\n"
+        "[stepper_x]\n"
+        "position_max: 250\n"
+        "\n"
+        "[printer]\n"
+        "kinematics: cartesian\n"
+    )
+    return printer_cfg
+
+
+def test_resolve(printer_cfg):
+    parser = IncludeResolver().resolve(printer_cfg)
+
+    assert parser.get_sections() == [
+        "stepper_x",
+        "gcode_macro A",
+        "gcode_macro B",
+        "printer",
+    ]
+    assert parser.config["#_header"] == ["# printer\n"]
+    assert parser.getval("stepper_x", "step_pin") == "PF0"
+    assert parser.getint("stepper_x", "position_max") == 250
+    assert parser.getval("gcode_macro B", "gcode") == ["  M117 B\n"]
+
+
+def test_files(printer_cfg):
+    files = IncludeResolver().files(printer_cfg)
+
+    base = printer_cfg.parent.resolve()
+    assert files == [
+        base.joinpath("printer.cfg"),
+        base.joinpath("stepper.cfg"),
+        base.joinpath("macros", "a.cfg"),
+        base.joinpath("macros", "b.cfg"),
+    ]
+
+
+def test_resolve_only_parses_changed_files(printer_cfg):
+    resolver = IncludeResolver()
+    resolver.resolve(printer_cfg)
+    misses = resolver._cache.misses
+
+    stepper_cfg = printer_cfg.parent.joinpath("stepper.cfg")
+    stepper_cfg.write_text("[stepper_x]\nstep_pin: PF1\n")
+    parser = resolver.resolve(printer_cfg)
+
+    assert parser.getval("stepper_x", "step_pin") == "PF1"
+    assert resolver._cache.misses == misses + 1
+    assert len(resolver._cache) == len(resolver.files(printer_cfg))
+
+
+def test_resolve_returns_a_copy(printer_cfg):
+    resolver = IncludeResolver()
+    parser = resolver.resolve(printer_cfg)
+    parser.set_option("stepper_x", "step_pin", "PA0")
+    parser.config["gcode_macro A"]["gcode"]["value"].append("  M117 C\n")
+
+    parser = resolver.resolve(printer_cfg)
+    assert parser.getval("stepper_x", "step_pin") == "PF0"
+    assert parser.getval("gcode_macro A", "gcode") == ["  M117 A\n"]
+
+
+def test_resolve_repeated_section_in_file_order(tmp_path):
+    tmp_path.joinpath("b.cfg").write_text("[a]\nx: 2\n")
+    printer_cfg = tmp_path.joinpath("printer.cfg")
+    printer_cfg.write_text("[a]\nx: 1\ny: 1\n\n[include b.cfg]\n\n[a]\nx: 3\n")
+
+    resolver = IncludeResolver()
+    for _ in range(2):
+        parser = resolver.resolve(printer_cfg)
+        assert parser.get_sections() == ["a"]
+        assert parser.getint("a", "x") == 3
+        assert parser.getint("a", "y") == 1
+    assert resolver.files(printer_cfg) == [printer_cfg, tmp_path.joinpath("b.cfg")]
+
+
+def test_resolve_missing_include(tmp_path):
+    printer_cfg = tmp_path.joinpath("printer.cfg")
+    printer_cfg.write_text("[include missing.cfg]\n[include missing/*.cfg]\n")
+
+    with pytest.raises(IncludeError):
+        IncludeResolver().resolve(printer_cfg)
+
+    printer_cfg.write_text("[include missing/*.cfg]\n")
+    assert IncludeResolver().resolve(printer_cfg).get_sections() == []
+
+
+def test_resolve_recursive_include(tmp_path):
+    tmp_path.joinpath("a.cfg").write_text("[include b.cfg]\n")
+    tmp_path.joinpath("b.cfg").write_text("[include a.cfg]\n")
+
+    with pytest.raises(IncludeError):
+        IncludeResolver().resolve(tmp_path.joinpath("a.cfg"))
+
+
+def test_invalidate(printer_cfg):
+    resolver = IncludeResolver()
+    resolver.resolve(printer_cfg)
+    count = len(resolver._cache)
+    resolver.invalidate(printer_cfg)
+    assert len(resolver._cache) == count - 1
+
+    resolver.invalidate()
+    assert len(resolver._cache) == 0
@@ -0,0 +1,81 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from src.simple_config_parser.interning import (
+    MAX_INTERNED_VALUE_LENGTH,
+    string_report,
+)
+from src.simple_config_parser.simple_config_parser import (
+    SimpleConfigParser,
+)
+
+CONFIG = """\
+[stepper_x]
+step_pin: PF0
+microsteps: 16
+gcode:
+  G28
+
+[stepper_y]
+step_pin: PF6
+microsteps: 16
+"""
+
+
+def _parse(string: str, intern_values: bool = False) -> SimpleConfigParser:
+    parser = SimpleConfigParser(intern_values=intern_values)
+    parser.read_string(string)
+    return parser
+
+
+def test_names_are_interned():
+    parser1 = _parse(CONFIG)
+    parser2 = _parse(CONFIG)
+
+    name1 = next(n for n in parser1.config["stepper_x"] if n == "microsteps")
+    name2 = next(n for n in parser2.config["stepper_y"] if n == "microsteps")
+    assert name1 is name2
+    section1 = next(s for s in parser1.config if s == "stepper_x")
+    section2 = next(s for s in parser2.config if s == "stepper_x")
+    assert section1 is section2
+
+
+def test_values_are_interned_on_request():
+    parser = _parse(CONFIG)
+    value_x = parser.config["stepper_x"]["microsteps"]["value"]
+    value_y = parser.config["stepper_y"]["microsteps"]["value"]
+    assert value_x is not value_y
+
+    parser = _parse(CONFIG, intern_values=True)
+    value_x = parser.config["stepper_x"]["microsteps"]["value"]
+    value_y = parser.config["stepper_y"]["microsteps"]["value"]
+    assert value_x is value_y
+
+
+def test_long_values_are_not_interned():
+    value = "x" * (MAX_INTERNED_VALUE_LENGTH + 1)
+    parser = _parse(f"[a]\noption: {value}\n[b]\noption: {value}\n", True)
+    assert (
+        parser.config["a"]["option"]["value"]
+        is not (parser.config["b"]["option"]["value"])
+    )
+
+
+def test_string_report():
+    configs = [_parse(CONFIG).config for _ in range(3)]
+    report = string_report(configs)
+
+    # 2 sections, 5 option names and 4 single line values per config
+    assert report.strings == 3 * (2 + 5 + 4)
+    assert report.unique == 2 + 3 + 3
+    assert report.saved_bytes > 0
+    assert report.duplicate_bytes > 0
+
+    configs = [_parse(CONFIG, intern_values=True).config for _ in range(3)]
+    report = string_report(configs)
+    assert report.objects == report.unique
+    assert report.duplicate_bytes == 0
@@ -0,0 +1,90 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+import json
+import pickle
+
+import pytest
+
+from src.simple_config_parser.nodes import OptionNode
+from src.simple_config_parser.simple_config_parser import (
+    SimpleConfigParser,
+)
+
+
+def test_parsed_options_are_nodes():
+    parser = SimpleConfigParser()
+    parser.read_string("[section]\noption: value\nblock:\n  line\n")
+
+    assert isinstance(parser.config["section"]["option"], OptionNode)
+    assert isinstance(parser.config["section"]["block"], OptionNode)
+    assert not hasattr(parser.config["section"]["option"], "__dict__")
+
+
+def test_dict_access():
+    option = OptionNode("option: value\n", "value")
+
+    assert option["_raw"] == "option: value\n"
+    assert option["value"] == "value"
+    assert "value" in option
+    assert "other" not in option
+    assert list(option) == ["_raw", "value"]
+    assert dict(option) == {"_raw": "option: value\n", "value": "value"}
+    assert option.get("other") is None
+
+    option["value"] = "other"
+    assert option.value == "other"
+    with pytest.raises(KeyError):
+        option["other"]  # noqa
+    with pytest.raises(KeyError):
+        option["other"] = "value"
+
+
+def test_equality():
+    option = OptionNode("block:\n", ["  line\n"])
+
+    assert option == {"_raw": "block:\n", "value": ["  line\n"]}
+    assert {"_raw": "block:\n", "value": ["  line\n"]} == option
+    assert option == OptionNode("block:\n", ["  line\n"])
+    assert option != OptionNode("block:\n", [])
+
+
+def test_copy_and_pickle():
+    option = OptionNode("block:\n", ["  line\n"])
+    copy = option.copy()
+    copy["value"].append("  other\n")
+
+    assert option["value"] == ["  line\n"]
+    assert pickle.loads(pickle.dumps(option)) == option
+
+
+def test_to_dict():
+    option = OptionNode("block:\n", ["  line\n"])
+    plain = option.to_dict()
+
+    assert type(plain) is dict
+    assert plain == {"_raw": "block:\n", "value": ["  line\n"]}
+    assert plain["value"] is not option.value
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_config_to_dict(lazy):
+    string = "# header\n[section_1]\noption: value\n\n[section_2]\nblock:\n  line\n"
+    parser = SimpleConfigParser()
+    parser.read_string(string, lazy=lazy)
+    plain = parser.to_dict()
+
+    assert plain == parser.config
+    assert json.loads(json.dumps(plain)) == plain
+    assert all(
+        type(option) is dict
+        for content in plain.values()
+        if isinstance(content, dict)
+        for option in content.values()
+        if not isinstance(option, (str, list))
+    )
+    assert plain["section_1"]["option"] == {"_raw": "option: value\n", "value": "value"}
@@ -6,11 +6,14 @@
 #  This file may be distributed under the terms of the GNU GPLv3 license  #
 # ======================================================================= #
 
+import copy
+
 import pytest
 
 from src.simple_config_parser.simple_config_parser import (
     NoOptionError,
     NoSectionError,
+    SimpleConfigParser,
 )
 
 
@@ -176,3 +179,99 @@ def test_set_new_option(parser):
 def test_remove_option(parser):
     parser.remove_option("section_1", "option_1")
     assert parser.has_option("section_1", "option_1") is False
+
+
+def test_has_option_ignores_raw_line_and_collectors(parser):
+    collector = next(key for key in parser.config["section_2"] if key.startswith("#_"))
+    assert parser.has_option("section_2", "_raw") is False
+    assert parser.has_option("section_2", collector) is False
+    assert parser.has_option("not_available", "option_1") is False
+
+
+def test_getval_ignores_raw_line_and_collectors(parser):
+    collector = next(key for key in parser.config["section_2"] if key.startswith("#_"))
+    with pytest.raises(NoOptionError):
+        parser.getval("section_2", "_raw")
+    with pytest.raises(NoOptionError):
+        parser.getval("section_2", collector)
+    assert parser.getval("section_2", collector, "fallback") == "fallback"
+
+
+def test_get_many(parser):
+    pairs = [
+        ("section_1", "option_1"),
+        ("section_3", "option_3"),
+        ("section_1", "option_1_2"),
+        ("section number 5", "multi_option"),
+    ]
+    assert parser.get_many(pairs) == [parser.getval(*pair) for pair in pairs]
+    assert parser.get_many([]) == []
+
+
+def test_get_many_fallback(parser):
+    pairs = [("section_1", "option_1"), ("section_1", "option_128")]
+    assert parser.get_many(pairs, "fallback") == ["value_1", "fallback"]
+    assert parser.get_many([("section_128", "option_1")], None) == [None]
+
+
+def test_get_many_exceptions(parser):
+    with pytest.raises(NoSectionError):
+        parser.get_many([("section_1", "option_1"), ("section_128", "option_1")])
+    with pytest.raises(NoOptionError):
+        parser.get_many([("section_1", "option_1"), ("section_1", "option_128")])
+
+
+def test_get_many_typed(parser):
+    assert parser.getint_many([("section_1", "option_1_2")]) == [5]
+    assert parser.getfloat_many([("section_1", "option_1_3")]) == [1.123]
+    assert parser.getboolean_many([("section_1", "option_1_1")]) == [True]
+
+    pairs = [("section_1", "option_1_2"), ("section_1", "option_1")]
+    assert parser.getint_many(pairs, fallback=0) == [5, 0]
+    with pytest.raises(ValueError):
+        parser.getint_many(pairs)
+
+
+def test_set_many(parser):
+    items = [
+        ("section_1", "option_1", "changed"),
+        ("new_section", "option_a", "value_a"),
+        ("new_section", "option_b", ["value_1", "value_2"]),
+        ("new_section_2", "option_c", "value_c"),
+        ("section_2", "option_d", "value_d"),
+    ]
+    expected = SimpleConfigParser()
+    expected.config = copy.deepcopy(parser.config)
+    for item in items:
+        expected.set_option(*item)
+
+    parser.set_many(items)
+    assert parser.config == expected.config
+
+
+def test_set_many_invalidates_converted_values(parser):
+    assert parser.getint("section_1", "option_1_2") == 5
+    parser.set_many([("section_1", "option_1_2", "7")])
+    assert parser.getint("section_1", "option_1_2") == 7
+
+
+def test_batch_adds_spacing_after_all_options():
+    parser = SimpleConfigParser()
+    with parser.batch():
+        parser.add_section("section_1")
+        parser.add_section("section_2")
+        with parser.batch():
+            parser.set_option("section_1", "option_1", "value_1")
+        parser.set_option("section_2", "option_2", "value_2")
+        parser.set_option("section_1", "option_1_1", "value_1_1")
+        assert parser.get_sections() == ["section_1", "section_2"]
+        assert "#_0" not in parser.config["section_1"]
+
+    assert list(parser.config["section_1"]) == [
+        "_raw",
+        "option_1",
+        "option_1_1",
+        "#_3",
+    ]
+    assert parser.config["section_1"]["#_3"] == ["\n"]
+    assert list(parser.config["section_2"]) == ["_raw", "option_2"]
@@ -0,0 +1,122 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from pathlib import Path
+
+import pytest
+
+from src.simple_config_parser.parallel import (
+    parse_file_parallel,
+    parse_many,
+    parse_string_parallel,
+)
+from src.simple_config_parser.simple_config_parser import SimpleConfigParser
+
+BASE_DIR = Path(__file__).parent.parent.joinpath("assets")
+CONFIG_FILES = [
+    BASE_DIR.joinpath("test_config_1.cfg"),
+    BASE_DIR.joinpath("klipper_config.txt"),
+    BASE_DIR.joinpath("does_not_exist.cfg"),
+    BASE_DIR.joinpath("test_config_2.cfg"),
+    BASE_DIR.joinpath("test_config_3.cfg"),
+]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_many(workers):
+    results = parse_many(CONFIG_FILES, workers=workers)
+    assert [result.path for result in results] == CONFIG_FILES
+
+    for result in results:
+        if not result.path.exists():
+            assert result.parser is None
+            assert isinstance(result.error, FileNotFoundError)
+            continue
+
+        parser = SimpleConfigParser()
+        parser.read_file(result.path)
+        assert result.error is None
+        assert result.parser.config == parser.config
+        assert result.parser.getval("section_1", "option_1", "x") == parser.getval(
+            "section_1", "option_1", "x"
+        )
+
+
+@pytest.mark.parametrize("read_options", [{}, {"lazy": True}])
+def test_parse_many_names_are_interned(read_options):
+    paths = [CONFIG_FILES[0], CONFIG_FILES[0]]
+    result_a, result_b = parse_many(paths, workers=2, **read_options)
+    config_a, config_b = result_a.parser.config, result_b.parser.config
+    for section_a, section_b in zip(config_a, config_b):
+        assert section_a is section_b
+        if isinstance(config_a[section_a], list):
+            continue
+        for key_a, key_b in zip(config_a[section_a], config_b[section_b]):
+            if not key_a.startswith("#_"):
+                assert key_a is key_b
+
+    lazy_a, lazy_b = result_a.parser._lazy_sections, result_b.parser._lazy_sections
+    assert all(name_a is name_b for name_a, name_b in zip(lazy_a, lazy_b))
+    assert result_a.parser.current_section is result_b.parser.current_section
+
+
+def test_parse_string_parallel_names_are_interned():
+    string = "".join(f"[section_{i}]\noption: {i}\n\n" for i in range(40))
+    parser_a = parse_string_parallel(string, workers=2)
+    parser_b = parse_string_parallel(string, workers=2)
+    for name_a, name_b in zip(parser_a.config, parser_b.config):
+        assert name_a is name_b
+        options_a = [key for key in parser_a.config[name_a] if key == "option"]
+        options_b = [key for key in parser_b.config[name_b] if key == "option"]
+        assert options_a[0] is options_b[0]
+
+
+def test_parse_many_read_options():
+    (result,) = parse_many([str(CONFIG_FILES[0])], lazy=True)
+    assert result.path == CONFIG_FILES[0]
+    assert "section_1" in result.parser._lazy_sections
+    assert result.parser.getval("section_1", "option_1") == "value_1"
+
+
+def test_parse_many_empty():
+    assert parse_many([]) == []
+
+
+@pytest.mark.parametrize("workers", [1, 2, 3])
+@pytest.mark.parametrize(
+    "config_file",
+    ["test_config_1.cfg", "test_config_3.cfg", "klipper_config.txt"],
+)
+def test_parse_file_parallel(workers, config_file):
+    file_path = BASE_DIR.joinpath(config_file)
+    parser = SimpleConfigParser()
+    parser.read_file(file_path)
+
+    parallel_parser = parse_file_parallel(file_path, workers=workers)
+    assert parallel_parser.config == parser.config
+    assert parallel_parser.current_section == parser.current_section
+    assert parallel_parser.current_opt_block == parser.current_opt_block
+    assert parallel_parser.current_collector == parser.current_collector
+
+
+def test_parse_string_parallel_duplicate_sections():
+    string = "# header\n" + "".join(
+        f"[section_{i % 5}]\noption: {i}\n\n" for i in range(40)
+    )
+    parser = parse_string_parallel(string, workers=4)
+    assert parser.get_sections() == [f"section_{i}" for i in range(5)]
+    assert parser.getval("section_0", "option") == "35"
+    assert parser.config["#_header"] == ["# header\n"]
+
+
+def test_parse_string_parallel_state_after_redefined_option():
+    string = "".join(f"[section_{i}]\noption: {i}\n\n" for i in range(40))
+    string += "[b]\ngcode: M1\n# comment\ngcode:\n  M2\n"
+    parser = parse_string_parallel(string, workers=2)
+    assert parser.current_section == "b"
+    assert parser.current_opt_block == "gcode"
+    assert parser.current_collector is None
@@ -0,0 +1,158 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+import os
+import pickle
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.simple_config_parser.parse_cache import CACHE_VERSION, ParseCache
+from src.simple_config_parser.simple_config_parser import (
+    SimpleConfigParser,
+)
+
+BASE_DIR = Path(__file__).parent.parent.joinpath("assets")
+TEST_DATA_PATH = BASE_DIR.joinpath("test_config_1.cfg")
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    config_file = Path(tmp_path).joinpath("printer.cfg")
+    shutil.copy(TEST_DATA_PATH, config_file)
+    return config_file
+
+
+def _fail_parsing(monkeypatch):
+    def read_file(*args, **kwargs):
+        raise AssertionError("file was parsed")
+
+    monkeypatch.setattr(SimpleConfigParser, "read_file", read_file)
+
+
+def test_read_file(tmp_path, config_file):
+    parser = SimpleConfigParser()
+    parser.read_file(config_file)
+
+    expected = parser.config
+    cache = ParseCache(tmp_path.joinpath("cache"))
+    assert cache.read_file(config_file).config == expected
+    assert cache.read_file(config_file).config == expected
+
+
+def test_cache_hit_does_not_parse(tmp_path, config_file, monkeypatch):
+    cache = ParseCache(tmp_path.joinpath("cache"))
+    parser = cache.read_file(config_file)
+
+    _fail_parsing(monkeypatch)
+    assert ParseCache(tmp_path.joinpath("cache")).read_file(config_file).config == (
+        parser.config
+    )
+
+
+def test_changed_file_is_parsed_again(tmp_path, config_file):
+    cache = ParseCache(tmp_path.joinpath("cache"))
+    cache.read_file(config_file)
+
+    config_file.write_text("[section_1]\noption_1: changed\n")
+    assert cache.read_file(config_file).getval("section_1", "option_1") == "changed"
+
+
+def test_verify_hash(tmp_path, config_file):
+    config_file.write_text("[section_1]\noption_1: aaa\n")
+    stat = os.stat(config_file)
+    cache = ParseCache(tmp_path.joinpath("cache"), verify_hash=True)
+    cache.read_file(config_file)
+
+    # same size and mtime, only the content changed
+    config_file.write_text("[section_1]\noption_1: bbb\n")
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert cache.read_file(config_file).getval("section_1", "option_1") == "bbb"
+
+
+def test_corrupt_cache_file(tmp_path, config_file):
+    cache = ParseCache(tmp_path.joinpath("cache"))
+    cache.read_file(config_file)
+    for cache_file in tmp_path.joinpath("cache").iterdir():
+        cache_file.write_bytes(b"corrupt")
+
+    assert cache.read_file(config_file).get_sections()
+
+
+# pickles of a global that no longer exists, as left by a moved module or class
+@pytest.mark.parametrize("moved", [b"cmoved_module\nThing\n.", b"cos\nMovedThing\n."])
+def test_cache_file_of_moved_class(tmp_path, config_file, moved):
+    cache = ParseCache(tmp_path.joinpath("cache"))
+    stat = os.stat(config_file)
+    stamp = (CACHE_VERSION, stat.st_mtime_ns, stat.st_size, None)
+    cache_file = cache._cache_file(config_file.resolve())  # noqa
+    cache_file.parent.mkdir(parents=True)
+    with open(cache_file, "wb") as f:
+        pickle.dump(stamp, f)
+        f.write(moved)
+
+    assert cache.read_file(config_file).get_sections()
+
+
+def test_unwritable_cache_dir(tmp_path, config_file):
+    # a file where the cache directory should be, so it can not be created
+    tmp_path.joinpath("cache").write_text("")
+    cache = ParseCache(tmp_path.joinpath("cache"))
+
+    assert cache.read_file(config_file).get_sections()
+    assert cache.read_file(config_file).get_sections()
+
+
+def test_invalidate_and_clear(tmp_path, config_file):
+    cache = ParseCache(tmp_path.joinpath("cache"))
+    cache.read_file(config_file)
+    cache.invalidate(config_file)
+    assert list(tmp_path.joinpath("cache").iterdir()) == []
+
+    cache.read_file(config_file)
+    cache.clear()
+    assert list(tmp_path.joinpath("cache").iterdir()) == []
+
+
+def test_cache_hit_returns_a_new_parser(tmp_path, config_file, monkeypatch):
+    parser = SimpleConfigParser()
+    parser.read_file(config_file)
+    ParseCache(tmp_path.joinpath("cache")).read_file(config_file)
+
+    _fail_parsing(monkeypatch)
+    cached = ParseCache(tmp_path.joinpath("cache")).read_file(config_file)
+    assert cached.getint("section_1", "option_1", fallback=0) == 0
+    assert cached.current_section == parser.current_section
+    assert cached.current_opt_block == parser.current_opt_block
+    assert cached.current_collector == parser.current_collector
+    # names are shared with other parsers again
+    for section_a, section_b in zip(cached.config, parser.config):
+        assert section_a is section_b
+
+
+def test_cache_file_holds_no_parser(tmp_path, config_file):
+    cache = ParseCache(tmp_path.joinpath("cache"))
+    cache.read_file(config_file)
+
+    with open(cache._cache_file(config_file.resolve()), "rb") as f:  # noqa
+        pickle.load(f)
+        config, state = pickle.load(f)
+    assert isinstance(config, dict)
+    assert len(state) == 3
+
+
+def test_outdated_cache_file(tmp_path, config_file):
+    cache = ParseCache(tmp_path.joinpath("cache"))
+    stat = os.stat(config_file)
+    stamp = (1, stat.st_mtime_ns, stat.st_size, None)
+    cache_file = cache._cache_file(config_file.resolve())  # noqa
+    cache_file.parent.mkdir(parents=True)
+    with open(cache_file, "wb") as f:
+        pickle.dump((stamp, SimpleConfigParser()), f)
+
+    assert cache.read_file(config_file).get_sections() != []
@@ -7,6 +7,8 @@
 # ======================================================================= #
 from pathlib import Path
 
+import pytest
+
 from src.simple_config_parser.simple_config_parser import (
     SimpleConfigParser,
 )
@@ -20,3 +22,125 @@ def test_read_file():
     parser.read_file(TEST_DATA_PATH)
     assert parser.config is not None
     assert parser.config.keys() is not None
+
+
+@pytest.mark.parametrize(
+    "config_file",
+    [
+        "test_config_1.cfg",
+        "test_config_2.cfg",
+        "test_config_3.cfg",
+        "klipper_config.txt",
+    ],
+)
+def test_read_file_mmap(config_file):
+    file_path = BASE_DIR.joinpath(config_file)
+    parser1 = SimpleConfigParser()
+    parser1.read_file(file_path)
+
+    parser2 = SimpleConfigParser()
+    parser2.read_file(file_path, use_mmap=True)
+
+    assert parser1.config == parser2.config
+
+
+def test_read_file_mmap_non_ascii(tmp_path):
+    tmp_file = Path(tmp_path).joinpath("tmp_config.cfg")
+    tmp_file.write_text(
+        "# größe\n[temperature_sensor kammer_°C]\nsensor: °C ; grad\nname: ok\n",
+        encoding="utf-8",
+    )
+    parser = SimpleConfigParser()
+    parser.read_file(tmp_file, use_mmap=True)
+
+    assert parser.getval("temperature_sensor kammer_°C", "sensor") == "°C"
+    assert parser.getval("temperature_sensor kammer_°C", "name") == "ok"
+    assert parser.config["temperature_sensor kammer_°C"]["sensor"]["_raw"] == (
+        "sensor: °C ; grad\n"
+    )
+
+
+def test_read_file_mmap_empty_file(tmp_path):
+    tmp_file = Path(tmp_path).joinpath("tmp_config.cfg")
+    tmp_file.touch()
+    parser = SimpleConfigParser()
+    parser.read_file(tmp_file, use_mmap=True)
+    assert parser.config == {}
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+@pytest.mark.parametrize(
+    "config_file",
+    [
+        "test_config_1.cfg",
+        "test_config_2.cfg",
+        "test_config_3.cfg",
+    ],
+)
+def test_read_file_binary_crlf_round_trip(tmp_path, config_file, lazy):
+    data = BASE_DIR.joinpath(config_file).read_bytes().replace(b"\n", b"\r\n")
+    tmp_file = Path(tmp_path).joinpath("tmp_config.cfg")
+    tmp_file.write_bytes(data)
+
+    parser = SimpleConfigParser()
+    parser.read_file(tmp_file, lazy=lazy, binary=True)
+    parser.write_file(tmp_file)
+
+    assert tmp_file.read_bytes() == data
+
+
+@pytest.mark.parametrize(
+    "read_options",
+    [{"use_mmap": True}, {"binary": True}, {"binary": True, "lazy": True}],
+)
+def test_read_file_unicode_whitespace(tmp_path, read_options):
+    string = (
+        "[section_1]\noption_1: 1\n\xa0\n\u2003# comment\n"
+        "option_2\xa0: value_2\xa0\n[section_2]\u2003# comment\noption_3: 3\n"
+    )
+    tmp_file = Path(tmp_path).joinpath("tmp_config.cfg")
+    tmp_file.write_bytes(string.encode("utf-8"))
+    expected = SimpleConfigParser()
+    expected.read_string(string)
+
+    parser = SimpleConfigParser()
+    parser.read_file(tmp_file, **read_options)
+    assert parser.get_sections() == ["section_1", "section_2"]
+    assert parser.getval("section_1", "option_2") == "value_2"
+    assert parser.config == expected.config
+
+    parser.write_file(tmp_file)
+    assert tmp_file.read_bytes() == string.encode("utf-8")
+
+
+def test_read_file_binary_lazy_non_ascii_section_lines(tmp_path):
+    # "[b\xa0]" is not a section line, as the name can not end with a whitespace
+    string = "[a]\nx: 1\n[b\xa0]\n# c\n[c]\xa0\ny: 2\n[d]\nz: 3\n"
+    tmp_file = Path(tmp_path).joinpath("tmp_config.cfg")
+    tmp_file.write_bytes(string.encode("utf-8"))
+    expected = SimpleConfigParser()
+    expected.read_string(string)
+
+    parser = SimpleConfigParser()
+    parser.read_file(tmp_file, binary=True, lazy=True)
+    assert parser.get_sections() == ["a", "c", "d"]
+    for section in parser.get_sections():
+        parser.get_options(section)
+    assert parser.config == expected.config
+
+
+def test_read_file_binary_values(tmp_path):
+    tmp_file = Path(tmp_path).joinpath("tmp_config.cfg")
+    tmp_file.write_bytes(
+        b"[section_1]\r\noption_1: value_1\r\n\r\n"
+        b"[section_2]\noption_2: 2 ; comment\r\ngcode:\r\n  M117\r\n"
+    )
+    parser = SimpleConfigParser()
+    parser.read_file(tmp_file, lazy=True, binary=True)
+
+    # section_1 is not decoded until it is accessed
+    assert parser.config["section_1"] == {"_raw": "[section_1]\r\n"}
+    assert parser.getval("section_1", "option_1") == "value_1"
+    assert parser.getint("section_2", "option_2") == 2
+    assert parser.getval("section_2", "gcode") == ["  M117\r\n"]
+    assert parser.config["section_1"]["option_1"]["_raw"] == "option_1: value_1\r\n"
@@ -0,0 +1,195 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from pathlib import Path
+
+import pytest
+
+from src.simple_config_parser.simple_config_parser import (
+    SimpleConfigParser,
+)
+
+BASE_DIR = Path(__file__).parent.parent.joinpath("assets")
+TEST_DATA_PATH = BASE_DIR.joinpath("test_config_1.cfg")
+CONFIG_FILES = [
+    "test_config_1.cfg",
+    "test_config_2.cfg",
+    "test_config_3.cfg",
+    "klipper_config.txt",
+]
+
+
+@pytest.fixture
+def parser():
+    parser = SimpleConfigParser()
+    parser.read_file(TEST_DATA_PATH, lazy=True)
+    return parser
+
+
+@pytest.mark.parametrize("config_file", CONFIG_FILES)
+def test_read_lazy(config_file):
+    file_path = BASE_DIR.joinpath(config_file)
+    parser1 = SimpleConfigParser()
+    parser1.read_file(file_path)
+
+    parser2 = SimpleConfigParser()
+    parser2.read_file(file_path, lazy=True)
+    assert parser2.get_sections() == parser1.get_sections()
+
+    for section in parser2.get_sections():
+        assert parser2.get_options(section) == parser1.get_options(section)
+
+    assert parser1.config == parser2.config
+    assert parser1.current_section == parser2.current_section
+
+
+@pytest.mark.parametrize("config_file", CONFIG_FILES)
+def test_read_lazy_write_file_like_eager(tmp_path, config_file):
+    file_path = BASE_DIR.joinpath(config_file)
+    eager = SimpleConfigParser()
+    eager.read_file(file_path)
+    eager.write_file(tmp_path.joinpath("eager.cfg"))
+    expected = tmp_path.joinpath("eager.cfg").read_text()
+
+    parser = SimpleConfigParser()
+    parser.read_file(file_path, lazy=True)
+    parser.write_file(tmp_path.joinpath("lazy.cfg"))
+    assert tmp_path.joinpath("lazy.cfg").read_text() == expected
+
+    # accessing a section does not change what is written
+    for section in parser.get_sections()[::2]:
+        parser.get_options(section)
+    parser.write_file(tmp_path.joinpath("lazy.cfg"))
+    assert tmp_path.joinpath("lazy.cfg").read_text() == expected
+
+
+def test_read_lazy_write_drops_lines_like_parsing():
+    string = "[a]\noption: 1\noption: 2\n\n[b]\noption: 3\n"
+    parser = SimpleConfigParser()
+    parser.read_string(string, lazy=True)
+
+    file = _RecordingFile()
+    parser._write_sections(file)  # noqa
+    assert "".join(file.writes) == "[a]\noption: 2\n\n[b]\noption: 3\n"
+    assert parser.config["a"] == {"_raw": "[a]\n"}
+
+
+def test_read_lazy_only_parses_section_lines(parser):
+    assert parser.config["section_1"] == {"_raw": "[section_1]\n"}
+    assert parser.config["section_2"] == {"_raw": "[section_2] ; comment\n"}
+    # the last section is always parsed
+    assert "option_5" in parser.config["section number 5"]
+
+
+def test_read_lazy_getval(parser):
+    assert parser.getval("section_3", "option_3") == "value_3"
+    assert parser.getint("section_1", "option_1_2") == 5
+    assert "option_3" in parser.config["section_3"]
+    assert parser.config["section_4"] == {"_raw": "[section_4]\n"}
+
+
+def test_read_lazy_set_option(parser):
+    parser.set_option("section_2", "option_2", "new_value")
+    parser.set_option("section_2", "new_option", "value")
+    assert parser.getval("section_2", "option_2") == "new_value"
+    assert parser.get_options("section_2") == ["option_2", "new_option"]
+
+
+def test_read_lazy_remove(parser):
+    parser.remove_option("section_1", "option_1")
+    parser.remove_section("section_2")
+    assert parser.has_option("section_1", "option_1") is False
+    assert parser.has_option("section_1", "option_1_1") is True
+    assert parser.has_section("section_2") is False
+
+
+def test_read_lazy_add_section(parser):
+    parser.remove_section("section number 5")
+    parser.add_section("new_section")
+    assert parser.get_sections()[-2:] == ["section_4", "new_section"]
+    assert parser.getval("section_4", "option_4") == "value_4"
+
+
+def test_read_lazy_write_file(tmp_path, parser):
+    tmp_file = Path(tmp_path).joinpath("tmp_config.cfg")
+    parser.getval("section_3", "option_3")
+    parser.write_file(tmp_file)
+
+    assert tmp_file.read_text() == TEST_DATA_PATH.read_text()
+
+
+def test_read_lazy_duplicate_section():
+    parser = SimpleConfigParser()
+    parser.read_string("[a]\nx: 1\n[b]\ny: 2\n[a]\nz: 3\n[c]\n", lazy=True)
+    assert parser.get_sections() == ["a", "b", "c"]
+    assert parser.get_options("a") == ["z"]
+
+
+def test_read_lazy_mmap():
+    parser = SimpleConfigParser()
+    with pytest.raises(ValueError):
+        parser.read_file(TEST_DATA_PATH, use_mmap=True, lazy=True)
+
+
+class _RecordingFile:
+    def __init__(self):
+        self.writes = []
+
+    def write(self, string):
+        self.writes.append(string)
+
+
+def test_read_lazy_write_unchanged_sections_at_once():
+    string = "[a]\noption: 1\n\n[b]\noption: 2\n\n[c]\noption: 3\n\n[d]\noption: 4\n"
+    parser = SimpleConfigParser()
+    parser.read_string(string, lazy=True)
+
+    file = _RecordingFile()
+    parser._write_sections(file)  # noqa
+    assert file.writes[0] == string[: string.index("[d]")]
+    assert "".join(file.writes) == string
+
+
+def test_read_lazy_write_renders_sections_once(monkeypatch):
+    string = "[a]\noption: 1\n\n[b]\noption: 2\noption: 3\n\n[c]\noption: 4\n"
+    parser = SimpleConfigParser()
+    parser.read_string(string, lazy=True)
+    expected = string.replace("option: 2\n", "")
+
+    rendered = []
+    lazy_section_text = SimpleConfigParser._lazy_section_text  # noqa
+
+    def record(self, section):
+        rendered.append(section)
+        return lazy_section_text(self, section)
+
+    monkeypatch.setattr(SimpleConfigParser, "_lazy_section_text", record)
+    for _ in range(2):
+        file = _RecordingFile()
+        parser._write_sections(file)  # noqa
+        assert "".join(file.writes) == expected
+    assert parser.reload_string(string) == []
+    assert rendered == ["a", "b"]
+
+    parser.config["b"]["_raw"] = "[b] ; changed\n"
+    file = _RecordingFile()
+    parser._write_sections(file)  # noqa
+    assert "".join(file.writes) == expected.replace("[b]", "[b] ; changed")
+    assert rendered == ["a", "b", "b"]
+
+
+def test_read_lazy_write_changed_sections():
+    string = "[a]\noption: 1\n\n[b]\noption: 2\n\n[c]\noption: 3\n\n[d]\noption: 4\n"
+    parser = SimpleConfigParser()
+    parser.read_string(string, lazy=True)
+    parser.getval("b", "option")
+    parser.config["c"]["_raw"] = "[c] ; changed\n"
+
+    file = _RecordingFile()
+    parser._write_sections(file)  # noqa
+    assert file.writes[0] == "[a]\noption: 1\n\n"
+    assert "".join(file.writes) == string.replace("[c]", "[c] ; changed")
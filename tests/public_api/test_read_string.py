@@ -0,0 +1,70 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from pathlib import Path
+
+import pytest
+
+from src.simple_config_parser.simple_config_parser import (
+    SimpleConfigParser,
+)
+
+BASE_DIR = Path(__file__).parent.parent.joinpath("assets")
+CONFIG_FILES = [
+    "test_config_1.cfg",
+    "test_config_2.cfg",
+    "test_config_3.cfg",
+    "klipper_config.txt",
+]
+
+
+@pytest.mark.parametrize("config_file", CONFIG_FILES)
+def test_read_string(config_file):
+    file_path = BASE_DIR.joinpath(config_file)
+    parser1 = SimpleConfigParser()
+    parser1.read_file(file_path)
+
+    parser2 = SimpleConfigParser()
+    parser2.read_string(file_path.read_text())
+
+    assert parser1.config == parser2.config
+    assert parser1.current_section == parser2.current_section
+
+
+# klipper_config.txt defines some sections more than once, only the last
+# definition of those sections is kept and written back
+@pytest.mark.parametrize("config_file", CONFIG_FILES[:-1])
+def test_read_bytes_round_trip(tmp_path, config_file):
+    file_path = BASE_DIR.joinpath(config_file)
+    tmp_file = Path(tmp_path).joinpath("tmp_config.cfg")
+    parser = SimpleConfigParser()
+    parser.read_bytes(file_path.read_bytes())
+    parser.write_file(tmp_file)
+
+    assert tmp_file.read_bytes() == file_path.read_bytes()
+
+
+@pytest.mark.parametrize(
+    "string",
+    [
+        "",
+        "\n",
+        "[section]",
+        "[section]\noption: value",
+        "# header\n\n[section]\noption:\n  value_1\n\n  value_2",
+        "[section]\r\noption: value\r\n\r\n; comment\r\n",
+    ],
+)
+def test_read_string_matches_line_parsing(string):
+    parser1 = SimpleConfigParser()
+    for line in string.splitlines(keepends=True):
+        parser1._parse_line(line)  # noqa
+
+    parser2 = SimpleConfigParser()
+    parser2.read_string(string)
+
+    assert parser1.config == parser2.config
@@ -0,0 +1,127 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from pathlib import Path
+
+import pytest
+
+from src.simple_config_parser.simple_config_parser import (
+    SimpleConfigParser,
+)
+
+BASE_DIR = Path(__file__).parent.parent.joinpath("assets")
+TEST_DATA_PATH = BASE_DIR.joinpath("test_config_1.cfg")
+TEST_DATA = TEST_DATA_PATH.read_text()
+
+
+@pytest.fixture
+def parser():
+    parser = SimpleConfigParser()
+    parser.read_file(TEST_DATA_PATH)
+    return parser
+
+
+def assert_same_as_fresh_parse(parser, string):
+    fresh = SimpleConfigParser()
+    fresh.read_string(string)
+    assert parser.config == fresh.config
+    assert parser.current_section == fresh.current_section
+    assert parser.current_opt_block == fresh.current_opt_block
+    assert parser.current_collector == fresh.current_collector
+
+
+def test_reload_unchanged(parser):
+    sections = {name: parser.config[name] for name in parser.get_sections()}
+    assert parser.reload_string(TEST_DATA) == []
+    for name, content in sections.items():
+        assert parser.config[name] is content
+    assert_same_as_fresh_parse(parser, TEST_DATA)
+
+
+def test_reload_changed_option(parser):
+    section_1 = parser.config["section_1"]
+    section_3 = parser.config["section_3"]
+    collector_ids = list(section_3.keys())
+    string = TEST_DATA.replace("option_2: value_2", "option_2: changed")
+
+    assert parser.reload_string(string) == ["section_2"]
+    assert parser.getval("section_2", "option_2") == "changed"
+    assert parser.config["section_1"] is section_1
+    assert list(parser.config["section_3"].keys()) == collector_ids
+    assert_same_as_fresh_parse(parser, string)
+
+
+def test_reload_added_and_removed_sections(parser):
+    string = TEST_DATA.replace("[section_3]", "[section_6]") + "[section_7]\n"
+    assert parser.reload_string(string) == ["section_6", "section_7"]
+    assert parser.has_section("section_3") is False
+    assert_same_as_fresh_parse(parser, string)
+
+
+def test_reload_changed_header(parser):
+    string = "# new header\n" + TEST_DATA
+    assert parser.reload_string(string) == []
+    assert parser.config["#_header"][0] == "# new header\n"
+    assert_same_as_fresh_parse(parser, string)
+
+
+def test_reload_last_section(parser):
+    string = TEST_DATA + "  value_5_4\n"
+    assert parser.reload_string(string) == ["section number 5"]
+    assert_same_as_fresh_parse(parser, string)
+
+    parser.reload_string(TEST_DATA + "\n# comment\n")
+    assert_same_as_fresh_parse(parser, TEST_DATA + "\n# comment\n")
+
+
+def test_reload_duplicate_sections():
+    string = "[a]\nx: 1\n\n[b]\ny: 2\n\n[a]\nz: 3\n"
+    parser = SimpleConfigParser()
+    parser.read_string(string)
+    section_a = parser.config["a"]
+
+    assert parser.reload_string(string) == []
+    assert parser.config["a"] is section_a
+    assert parser.reload_string(string.replace("z: 3", "z: 4")) == ["a"]
+    assert parser.getval("a", "z") == "4"
+
+
+def test_reload_modified_in_memory(parser):
+    parser.set_option("section_1", "option_1", "changed")
+    assert parser.reload_string(TEST_DATA) == ["section_1"]
+    assert parser.getval("section_1", "option_1") == "value_1"
+
+
+def test_reload_lazy():
+    parser = SimpleConfigParser()
+    parser.read_string(TEST_DATA, lazy=True)
+    string = TEST_DATA.replace("option_4: value_4", "option_4: changed")
+
+    assert parser.reload_string(string) == ["section_4"]
+    assert "section_2" in parser._lazy_sections
+    assert parser.getval("section_2", "option_2") == "value_2"
+    assert parser.getval("section_4", "option_4") == "changed"
+
+
+def test_reload_file(tmp_path, parser):
+    tmp_file = Path(tmp_path).joinpath("tmp_config.cfg")
+    tmp_file.write_text(TEST_DATA.replace("value_3", "changed"))
+    assert parser.reload_file(tmp_file) == ["section_3"]
+    assert parser.getval("section_3", "option_3") == "changed"
+
+
+@pytest.mark.parametrize("change", [False, True])
+def test_reload_state_after_redefined_option(change):
+    string = "[a]\nx: 1\n\n[b]\ngcode: M1\n# comment\ngcode:\n  M2\n"
+    parser = SimpleConfigParser()
+    parser.read_string(string)
+    if change:
+        string = string.replace("M2", "M3")
+
+    parser.reload_string(string)
+    assert_same_as_fresh_parse(parser, string)
+    assert parser.current_opt_block == "gcode"
@@ -0,0 +1,145 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from pathlib import Path
+
+import pytest
+
+from src.simple_config_parser.save_config import (
+    SaveConfigParser,
+    split_save_config,
+)
+from src.simple_config_parser.simple_config_parser import (
+    NoOptionError,
+    NoSectionError,
+)
+
+MAIN = """\
+[extruder]
+control: pid
+pid_Kp: 22.2
+pid_Ki: 1.08
+max_temp: 250
+
+[gcode_macro START]
+gcode:
+  G28
+"""
+
+SAVE_CONFIG = """\
+#*# <---------------------- SAVE_CONFIG ---------------------->
+#*# DO NOT EDIT THIS BLOCK OR BELOW. The contents are auto-generated.
+#*#
+#*# [extruder]
+#*# pid_kp = 26.213
+#*# pid_ki = 1.304
+#*#
+#*# [bed_mesh default]
+#*# version = 1
+#*# points =
+#*# 	0.010000, 0.020000
+#*# 	0.030000, 0.040000
+#*# x_count = 2
+"""
+
+
+@pytest.fixture
+def parser():
+    parser = SaveConfigParser()
+    parser.read_string(MAIN + "\n" + SAVE_CONFIG)
+    return parser
+
+
+def test_split_save_config():
+    assert split_save_config(MAIN + SAVE_CONFIG) == (MAIN, SAVE_CONFIG)
+    assert split_save_config(MAIN) == (MAIN, "")
+
+
+def test_save_config_is_not_part_of_main(parser):
+    assert parser.main.getval("gcode_macro START", "gcode") == ["  G28\n", "\n"]
+    assert parser.main.get_sections() == ["extruder", "gcode_macro START"]
+    assert parser.save_config.get_sections() == ["extruder", "bed_mesh default"]
+
+
+def test_effective_values(parser):
+    assert parser.getfloat("extruder", "pid_kp") == 26.213
+    assert parser.getval("extruder", "control") == "pid"
+    assert parser.getint("extruder", "max_temp") == 250
+    assert parser.getint("bed_mesh default", "x_count") == 2
+    assert parser.getval("bed_mesh default", "points") == [
+        "\t0.010000, 0.020000\n",
+        "\t0.030000, 0.040000\n",
+    ]
+    assert parser.is_overridden("extruder", "pid_ki")
+    assert not parser.is_overridden("extruder", "max_temp")
+
+
+def test_sections_and_options(parser):
+    assert parser.get_sections() == [
+        "extruder",
+        "gcode_macro START",
+        "bed_mesh default",
+    ]
+    assert parser.has_section("bed_mesh default")
+    assert not parser.has_section("bed_mesh other")
+    assert parser.get_options("extruder") == [
+        "control",
+        "pid_Kp",
+        "pid_Ki",
+        "max_temp",
+    ]
+    assert parser.has_option("bed_mesh default", "version")
+    assert not parser.has_option("extruder", "_raw")
+
+
+def test_overrides_ignore_the_case_of_option_names(parser):
+    # Klipper lowercases option names, SAVE_CONFIG writes them lowercased
+    assert parser.getval("extruder", "pid_Kp") == "26.213"
+    assert parser.getfloat("extruder", "pid_Ki") == 1.304
+    assert parser.getfloat("extruder", "PID_KP") == 26.213
+    assert parser.is_overridden("extruder", "pid_Kp")
+    assert parser.has_option("extruder", "PID_KI")
+    assert not parser.has_option("extruder", "MAX_TEMP")
+
+
+def test_missing_values(parser):
+    with pytest.raises(NoSectionError):
+        parser.getval("missing", "option")
+    with pytest.raises(NoOptionError):
+        parser.getval("bed_mesh default", "missing")
+    assert parser.getval("missing", "option", "fallback") == "fallback"
+    assert parser.getint("extruder", "missing", 3) == 3
+
+
+def test_write_file(tmp_path, parser):
+    tmp_file = Path(tmp_path).joinpath("printer.cfg")
+    parser.write_file(tmp_file)
+    assert tmp_file.read_text() == MAIN + "\n" + SAVE_CONFIG
+
+    parser.save_config.set_option("extruder", "pid_kd", "131.7")
+    parser.write_file(tmp_file)
+
+    written = SaveConfigParser()
+    written.read_file(tmp_file)
+    assert written.getfloat("extruder", "pid_kd") == 131.7
+    assert written.getfloat("extruder", "pid_kp") == 26.213
+
+
+def test_conversions(parser):
+    assert parser.getint("extruder", "max_temp") == 250
+    assert parser.getfloat("extruder", "pid_kp") == 26.213
+    # conversions are memoized by the parser that holds the value
+    assert parser.main._conv_cache["extruder"]
+    assert parser.save_config._conv_cache["extruder"]
+
+    with pytest.raises(ValueError):
+        parser.getint("extruder", "control")
+    assert parser.getint("extruder", "control", 0) == 0
+    with pytest.raises(NoOptionError):
+        parser.getint("extruder", "missing")
+    with pytest.raises(NoSectionError):
+        parser.getboolean("missing", "option")
@@ -10,6 +10,7 @@ import pytest
 
 from src.simple_config_parser.simple_config_parser import (
     DuplicateSectionError,
+    SimpleConfigParser,
 )
 
 
@@ -64,3 +65,94 @@ def test_remove_section(parser):
     assert parser.has_section("section_1") is False
     assert len(parser.get_sections()) == pre_remove_count - 1
     assert "section_1" not in parser.config
+
+
+def test_has_section_header(parser):
+    assert "#_header" in parser.config
+    assert parser.has_section("#_header") is False
+    assert "#_header" not in parser.get_sections()
+
+
+def test_add_section_keeps_order(parser):
+    sections = parser.get_sections()
+    parser.add_section("new_section")
+    parser.remove_section(sections[0])
+    parser.add_section(sections[0])
+    assert parser.get_sections() == [*sections[1:], "new_section", sections[0]]
+
+
+def test_add_section_to_header_only_config():
+    parser = SimpleConfigParser()
+    parser.read_string("# header\n")
+    parser.add_section("section_1")
+    parser.add_section("section_2")
+    assert parser.get_sections() == ["section_1", "section_2"]
+    assert parser.config["#_header"] == ["# header\n"]
+
+
+KLIPPER_SECTIONS = """\
+[stepper_x]
+[stepper_y]
+[stepper_z]
+[stepper_z1]
+[extruder]
+[gcode_macro PRINT_START]
+[extruder1]
+[temperature_sensor chamber]
+[gcode_macro PRINT_END]
+[temperature_sensor mcu]
+"""
+
+
+@pytest.fixture
+def klipper_parser():
+    parser = SimpleConfigParser()
+    parser.read_string(KLIPPER_SECTIONS)
+    return parser
+
+
+def test_get_sections_of_type(klipper_parser):
+    assert klipper_parser.get_sections_of_type("gcode_macro") == [
+        "gcode_macro PRINT_START",
+        "gcode_macro PRINT_END",
+    ]
+    assert klipper_parser.get_sections_of_type("stepper_z1") == ["stepper_z1"]
+    assert klipper_parser.get_sections_of_type("heater_bed") == []
+
+
+def test_get_sections_with_prefix(klipper_parser):
+    assert klipper_parser.get_sections_with_prefix("stepper_") == [
+        "stepper_x",
+        "stepper_y",
+        "stepper_z",
+        "stepper_z1",
+    ]
+    assert klipper_parser.get_sections_with_prefix("extruder") == [
+        "extruder",
+        "extruder1",
+    ]
+    assert klipper_parser.get_sections_with_prefix("gcode_macro PRINT_S") == [
+        "gcode_macro PRINT_START"
+    ]
+
+
+def test_section_type_index_is_updated(klipper_parser):
+    assert klipper_parser.get_section_types()[:2] == ["stepper_x", "stepper_y"]
+
+    klipper_parser.add_section("gcode_macro HOME")
+    klipper_parser.remove_section("gcode_macro PRINT_START")
+    klipper_parser.remove_section("stepper_x")
+    assert klipper_parser.get_sections_of_type("gcode_macro") == [
+        "gcode_macro PRINT_END",
+        "gcode_macro HOME",
+    ]
+    assert "stepper_x" not in klipper_parser.get_section_types()
+
+    klipper_parser.read_string("[gcode_macro PARK]\n")
+    klipper_parser.add_section("temperature_sensor host")
+    assert klipper_parser.get_sections_of_type("gcode_macro")[-1] == (
+        "gcode_macro PARK"
+    )
+    assert klipper_parser.get_sections_of_type("temperature_sensor")[-1] == (
+        "temperature_sensor host"
+    )
@@ -9,7 +9,10 @@ from pathlib import Path
 
 import pytest
 
-from src.simple_config_parser.simple_config_parser import SimpleConfigParser
+from src.simple_config_parser.simple_config_parser import (
+    NoSectionError,
+    SimpleConfigParser,
+)
 from tests.utils import load_testdata_from_file
 
 BASE_DIR = Path(__file__).parent.parent.joinpath("assets")
@@ -87,3 +90,36 @@ def test_get_float_conv_exception(parser):
 def test_get_bool_conv_exception(parser):
     with pytest.raises(ValueError):
         parser._get_conv("section_1", "option_1", parser._convert_to_boolean)
+
+
+def test_conv_is_cached(parser):
+    calls = []
+
+    def conv(value):
+        calls.append(value)
+        return int(value)
+
+    assert parser._get_conv("section_1", "option_1_2", conv) == 5
+    assert parser._get_conv("section_1", "option_1_2", conv) == 5
+    assert calls == ["5"]
+
+
+def test_conv_cache_set_option(parser):
+    assert parser.getint("section_1", "option_1_2") == 5
+    parser.set_option("section_1", "option_1_2", "6")
+    assert parser.getint("section_1", "option_1_2") == 6
+
+    # changing the value directly is noticed as well
+    parser.config["section_1"]["option_1_2"]["value"] = "7"
+    assert parser.getint("section_1", "option_1_2") == 7
+
+
+def test_conv_cache_remove(parser):
+    assert parser.getint("section_1", "option_1_2") == 5
+    parser.remove_option("section_1", "option_1_2")
+    assert parser.getint("section_1", "option_1_2", 3) == 3
+
+    assert parser.getboolean("section_1", "option_1_1") is True
+    parser.remove_section("section_1")
+    with pytest.raises(NoSectionError):
+        parser.getboolean("section_1", "option_1_1")